@@ -1,4 +1,5 @@
 from flask import Flask
+import multiprocessing
 import os
 from flask_sqlalchemy import SQLAlchemy
 from flask_migrate import Migrate
@@ -22,6 +23,9 @@ def create_app(config_class=Config):
 
     from app.models import User, File, Section, Alert, Escalation
     
+    from app.commands import register_commands
+    register_commands(app)
+    
     from app.routes.auth import auth_bp
     from app.routes.files import files_bp
     from app.routes.dashboard import dashboard_bp
@@ -32,8 +36,12 @@ def create_app(config_class=Config):
     app.register_blueprint(dashboard_bp, url_prefix='/api/dashboard')
     app.register_blueprint(reports_bp, url_prefix='/api/reports')
     
-    # Start Scheduler
-    if not app.debug or os.environ.get('WERKZEUG_RUN_MAIN') == 'true':
+    # Start Scheduler (only the process holding the scheduler lease runs jobs).
+    # Never in multiprocessing children: spawned report workers re-import the main
+    # module, which may call create_app(), and must not compete for the lease.
+    # (parent_process() is not set yet while the child imports __main__; its name is.)
+    if app.config.get('SCHEDULER_ENABLED', True) and multiprocessing.current_process().name == 'MainProcess' \
+            and (not app.debug or os.environ.get('WERKZEUG_RUN_MAIN') == 'true'):
         from app.services.scheduler_service import start_scheduler
         start_scheduler(app)
 
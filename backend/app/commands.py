@@ -0,0 +1,25 @@
+import click
+from flask.cli import with_appcontext
+from app.services import counter_service
+
+@click.command('rebuild-counters')
+@click.option('--verify-only', is_flag=True, help='Report mismatches without rewriting the table.')
+@with_appcontext
+def rebuild_counters_command(verify_only):
+    """Verify and rebuild the section_status_counts table from the file table."""
+    mismatches = counter_service.verify()
+    for section_id, status, stored, actual in mismatches:
+        click.echo(f"Section {section_id} / {status}: stored {stored}, actual {actual}")
+
+    if not mismatches:
+        click.echo("Counters are consistent.")
+        return
+
+    if verify_only:
+        raise SystemExit(1)
+
+    counter_service.rebuild()
+    click.echo(f"Rebuilt counters ({len(mismatches)} mismatches fixed).")
+
+def register_commands(app):
+    app.cli.add_command(rebuild_counters_command)
@@ -31,30 +31,112 @@ class Section(db.Model):
     files = db.relationship('File', backref='section_ref', lazy=True)
 
 class File(db.Model):
+    # Composite indexes matching the hot query shapes (listings, alerts, SLA sweep, counts)
+    __table_args__ = (
+        db.Index('ix_file_listing', 'is_deleted', 'upload_date', 'id'),
+        db.Index('ix_file_section_listing', 'section_id', 'is_deleted', 'upload_date', 'id'),
+        db.Index('ix_file_alerts', 'status', 'is_deleted', 'sla_halfway'),
+        db.Index('ix_file_section_alerts', 'section_id', 'status', 'is_deleted', 'sla_halfway'),
+        db.Index('ix_file_sla_sweep', 'status', 'sla_deadline'),
+        db.Index('ix_file_section_status', 'is_deleted', 'section_id', 'status'),
+        db.Index('ix_file_deadline_refresh', 'extraction_updated_at'),
+        db.Index('ix_file_escalation', 'status', 'is_deleted', 'priority', 'escalation_level', 'sla_deadline'),
+    )
+
     id = db.Column(db.Integer, primary_key=True)
     filename = db.Column(db.String(255), nullable=False)
     file_path = db.Column(db.String(255), nullable=False)
+    content_hash = db.Column(db.String(64), nullable=True, index=True) # SHA-256 of the stored blob
     section_id = db.Column(db.Integer, db.ForeignKey('section.id'), nullable=False)
     priority = db.Column(db.String(20), default='Medium') # Low, Medium, High, Critical
-    status = db.Column(db.String(20), default='Pending') # Pending, Completed, Overdue
+    status = db.Column(db.String(20), default='Pending') # Extracting, Pending, Completed, Overdue
     upload_date = db.Column(db.DateTime, default=datetime.utcnow)
     extracted_date = db.Column(db.Date, nullable=True)
     sla_deadline = db.Column(db.DateTime, nullable=True)
+    sla_halfway = db.Column(db.DateTime, nullable=True) # upload_date + half the SLA window, for alert queries
     completion_date = db.Column(db.DateTime, nullable=True)
     reminder_sent = db.Column(db.Boolean, default=False)
     escalation_level = db.Column(db.Integer, default=0)
     is_deleted = db.Column(db.Boolean, default=False)
     deletion_remarks = db.Column(db.String(255), nullable=True)
+    extraction_status = db.Column(db.String(20), default='Queued') # Queued, Running, Done, Failed
+    extraction_updated_at = db.Column(db.DateTime, default=datetime.utcnow) # last extraction_status change, to spot lost jobs
 
 class Alert(db.Model):
     id = db.Column(db.Integer, primary_key=True)
-    file_id = db.Column(db.Integer, db.ForeignKey('file.id'), nullable=False)
+    file_id = db.Column(db.Integer, db.ForeignKey('file.id'), nullable=False, index=True)
     message = db.Column(db.String(255), nullable=False)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     is_read = db.Column(db.Boolean, default=False)
 
 class Escalation(db.Model):
+    # One row per level a file reached (see escalation_service)
+    __table_args__ = (
+        db.UniqueConstraint('file_id', 'level', name='uq_escalation_file_level'),
+    )
+
     id = db.Column(db.Integer, primary_key=True)
-    file_id = db.Column(db.Integer, db.ForeignKey('file.id'), nullable=False)
+    file_id = db.Column(db.Integer, db.ForeignKey('file.id'), nullable=False, index=True)
     level = db.Column(db.Integer, nullable=False)
     triggered_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+class ExtractionCache(db.Model):
+    __table_args__ = (
+        db.UniqueConstraint('content_hash', 'model_name', 'prompt_version', name='uq_extraction_cache_key'),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    content_hash = db.Column(db.String(64), nullable=False)
+    model_name = db.Column(db.String(64), nullable=False)
+    prompt_version = db.Column(db.String(20), nullable=False)
+    extracted_date = db.Column(db.String(10), nullable=True) # YYYY-MM-DD, as returned by extract_metadata
+    priority = db.Column(db.String(20), nullable=False)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    last_used_at = db.Column(db.DateTime, default=datetime.utcnow, index=True)
+    hits = db.Column(db.Integer, default=0)
+
+class UploadSession(db.Model):
+    id = db.Column(db.String(32), primary_key=True) # uuid4 hex, handed to the client as upload_id
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
+    section_id = db.Column(db.Integer, db.ForeignKey('section.id'), nullable=False)
+    filename = db.Column(db.String(255), nullable=False)
+    total_size = db.Column(db.BigInteger, nullable=True)
+    received = db.Column(db.BigInteger, default=0)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+class SectionStatusCount(db.Model):
+    """
+    Number of non-deleted files per (section, status), kept up to date in the
+    same transaction as every status change or deletion (see counter_service).
+    """
+    __tablename__ = 'section_status_counts'
+
+    section_id = db.Column(db.Integer, db.ForeignKey('section.id'), primary_key=True)
+    status = db.Column(db.String(20), primary_key=True)
+    count = db.Column(db.Integer, nullable=False, default=0)
+
+class SchedulerLease(db.Model):
+    """
+    Named lease held by the one process allowed to run scheduled jobs. The
+    holder renews expires_at on every heartbeat; once it lapses another
+    process may take it over (see lease_service).
+    """
+    __tablename__ = 'scheduler_lease'
+
+    name = db.Column(db.String(64), primary_key=True)
+    holder = db.Column(db.String(128), nullable=False)
+    acquired_at = db.Column(db.DateTime, default=datetime.utcnow)
+    expires_at = db.Column(db.DateTime, nullable=False)
+
+class ReportJob(db.Model):
+    """Detailed report rendered in the background (see report_job_service)."""
+    id = db.Column(db.String(32), primary_key=True) # uuid4 hex, handed to the client as job_id
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
+    section_id = db.Column(db.Integer, db.ForeignKey('section.id'), nullable=True) # None covers every section
+    status = db.Column(db.String(20), default='Queued') # Queued, Running, Done, Failed
+    file_path = db.Column(db.String(255), nullable=True)
+    error = db.Column(db.String(255), nullable=True)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    heartbeat_at = db.Column(db.DateTime, default=datetime.utcnow) # touched while queued or running, to spot lost jobs
+    finished_at = db.Column(db.DateTime, nullable=True)
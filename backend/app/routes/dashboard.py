@@ -1,9 +1,11 @@
-from flask import Blueprint, jsonify
-from app.models import File, Section
+from flask import Blueprint, jsonify, request, current_app
 from app.routes.auth import token_required
-from sqlalchemy import func
-from datetime import datetime
-from flask import jsonify
+from app.services.alert_service import get_sla_alerts
+from app.services.stats_service import get_statistics
+from app.services.analytics_service import get_analytics
+from app.services.cache_service import get_cache, dashboard_key
+from app.services import extraction_cache
+from app.services.extractors.preprocess import preprocess_stats
 
 dashboard_bp = Blueprint('dashboard', __name__)
 
@@ -11,95 +13,66 @@ dashboard_bp = Blueprint('dashboard', __name__)
 @token_required
 def get_stats(current_user):
     # Filter by section if user belongs to one
-    if current_user.section_id:
-        # Overall Stats (Scoped to Section)
-        total = File.query.filter_by(section_id=current_user.section_id).count()
-        pending = File.query.filter_by(section_id=current_user.section_id, status='Pending').count()
-        completed = File.query.filter_by(section_id=current_user.section_id, status='Completed').count()
-        overdue = File.query.filter_by(section_id=current_user.section_id, status='Overdue').count()
-        
-        # Section-wise Stats (Only show their section)
-        sections = Section.query.filter_by(id=current_user.section_id).all()
-    else:
-        # Overall Stats (Global)
-        total = File.query.filter_by(is_deleted=False).count()
-        pending = File.query.filter_by(status='Pending', is_deleted=False).count()
-        completed = File.query.filter_by(status='Completed', is_deleted=False).count()
-        overdue = File.query.filter_by(status='Overdue', is_deleted=False).count()
-        
-        # Section-wise Stats (All Sections)
-        sections = Section.query.all()
+    section_id = current_user.section_id
+    stats = get_cache().get_or_compute(dashboard_key('stats', section_id), lambda: _compute_stats(section_id))
+    return jsonify(stats)
 
-    section_stats = []
-    for section in sections:
-        s_pending = File.query.filter_by(section_id=section.id, status='Pending', is_deleted=False).count()
-        s_overdue = File.query.filter_by(section_id=section.id, status='Overdue', is_deleted=False).count()
-        s_completed = File.query.filter_by(section_id=section.id, status='Completed', is_deleted=False).count()
-        s_total = File.query.filter_by(section_id=section.id, is_deleted=False).count()
+def _compute_stats(section_id):
+    stats = get_statistics(section_id)
         
-        section_stats.append({
-            'name': section.name,
-            'pending': s_pending,
-            'overdue': s_overdue,
-            'completed': s_completed,
-            'total': s_total
-        })
-        
-    return jsonify({
-        'overview': {
-            'total': total,
-            'pending': pending,
-            'completed': completed,
-            'overdue': overdue
-        },
-        'sections': section_stats
-    })
+    return {
+        'overview': stats['overview'],
+        'sections': [
+            {
+                'name': section['name'],
+                'pending': section['pending'],
+                'overdue': section['overdue'],
+                'completed': section['completed'],
+                'total': section['total']
+            }
+            for section in stats['sections']
+        ]
+    }
 
 @dashboard_bp.route('/alerts', methods=['GET'])
 @token_required
 def get_alerts(current_user):
-    # Logic:
-    # 1. Get all Pending files
-    # 2. Filter by section if User has section_id
-    # 3. Calculate SLA time elapsed
-    # 4. If > 50% elapsed, add to alerts list
-    
-    query = File.query.filter_by(status='Pending', is_deleted=False)
-    
-    if current_user.section_id:
-        query = query.filter_by(section_id=current_user.section_id)
-        
-    pending_files = query.all()
-    alerts = []
-    
-    now = datetime.utcnow()
-    
-    for file in pending_files:
-        if file.sla_deadline and file.upload_date:
-            total_sla_duration = (file.sla_deadline - file.upload_date).total_seconds()
-            elapsed_duration = (now - file.upload_date).total_seconds()
-            
-            if total_sla_duration > 0 and elapsed_duration > (total_sla_duration / 2):
-                # Calculate percentage for UI
-                percentage = min(100, int((elapsed_duration / total_sla_duration) * 100))
-                time_left = file.sla_deadline - now
-                
-                # Format time left friendly
-                days = time_left.days
-                hours = time_left.seconds // 3600
-                time_left_str = f"{days}d {hours}h" if days > 0 else f"{hours}h"
-                if time_left.total_seconds() < 0:
-                     time_left_str = "Overdue"
+    # Pending files past `threshold` (default 50%) of their SLA, most urgent first
+    threshold = request.args.get('threshold', default=0.5, type=float)
+    if not 0 <= threshold <= 1:
+        return jsonify({'message': 'threshold must be between 0 and 1'}), 400
+
+    max_limit = current_app.config.get('ALERTS_MAX_LIMIT', 500)
+    limit = request.args.get('limit', default=current_app.config.get('ALERTS_DEFAULT_LIMIT', 100), type=int)
+    limit = max(1, min(limit, max_limit))
 
-                alerts.append({
-                    'id': file.id,
-                    'filename': file.filename,
-                    'section': file.section_ref.name,
-                    'upload_date': file.upload_date.strftime('%Y-%m-%d'),
-                    'sla_deadline': file.sla_deadline.strftime('%Y-%m-%d'),
-                    'percentage': percentage,
-                    'time_left': time_left_str,
-                    'priority': file.priority
-                })
-    
+    section_id = current_user.section_id
+    alerts = get_cache().get_or_compute(
+        dashboard_key(f'alerts:{threshold}:{limit}', section_id),
+        lambda: get_sla_alerts(section_id, threshold, limit)
+    )
     return jsonify(alerts)
+
+@dashboard_bp.route('/analytics', methods=['GET'])
+@token_required
+def get_sla_analytics(current_user):
+    # Turnaround percentiles, SLA hit rate and overdue ageing; heavier than /stats, so cached longer
+    section_id = current_user.section_id
+    analytics = get_cache().get_or_compute(
+        dashboard_key('analytics', section_id),
+        lambda: get_analytics(section_id),
+        ttl=current_app.config.get('ANALYTICS_CACHE_TTL', 300)
+    )
+    return jsonify(analytics)
+
+@dashboard_bp.route('/cache/stats', methods=['GET'])
+@token_required
+def get_cache_stats(current_user):
+    if current_user.role != 'Admin':
+        return jsonify({'message': 'Permission denied'}), 403
+
+    return jsonify({
+        'dashboard': get_cache().stats(),
+        'extraction': extraction_cache.cache_stats(),
+        'preprocess': preprocess_stats()
+    })
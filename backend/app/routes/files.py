@@ -1,47 +1,120 @@
-import os
-from flask import Blueprint, request, jsonify, current_app, send_from_directory
+from flask import Blueprint, request, jsonify, current_app, send_file, send_from_directory
 from werkzeug.utils import secure_filename
 from app import db
-from app.models import File, Section
+from app.models import File, Section, UploadSession
 from app.routes.auth import token_required
-from app.services.ai_service import extract_metadata
-from datetime import datetime, timedelta
+from app.services.blob_store import store_stream, blob_path
+from app.services import chunked_upload, counter_service
+from app.services.extraction_service import submit_extraction, extract_batch, apply_metadata
+from app.services.sla_service import apply_sla
+from app.services.scheduler_service import notify_deadline, cancel_deadline
+from app.services.listing_service import file_listing_query, serialize_rows, apply_listing_filters
+from sqlalchemy import and_, or_
+from datetime import datetime
+import base64
+import binascii
+import uuid
 
 files_bp = Blueprint('files', __name__)
 
 ALLOWED_EXTENSIONS = {'txt', 'pdf', 'png', 'jpg', 'jpeg', 'docx'}
 
+# Fields returned by the listing endpoints (must include id and upload_date for the cursor)
+FILE_LIST_FIELDS = ['id', 'filename', 'section', 'priority', 'status', 'upload_date', 'extracted_date', 'sla_deadline']
+DELETED_FILE_LIST_FIELDS = ['id', 'filename', 'section', 'priority', 'status', 'upload_date', 'extracted_date', 'deletion_remarks']
+
 def allowed_file(filename):
     return '.' in filename and \
            filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
 
+def _encode_cursor(row):
+    raw = f"{row.upload_date.isoformat()}|{row.id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+def _decode_cursor(cursor):
+    raw = base64.urlsafe_b64decode(cursor.encode()).decode()
+    upload_date, file_id = raw.split('|')
+    return datetime.fromisoformat(upload_date), int(file_id)
+
+def _paginate(query, args):
+    """
+    Keyset pagination on (upload_date, id), newest first. The cursor is the
+    position of the last row of the previous page, so every page is an index
+    range scan no matter how deep the client has scrolled.
+    Returns (rows, next_cursor, error).
+    """
+    page_size = current_app.config.get('FILE_LIST_PAGE_SIZE', 50)
+    max_page_size = current_app.config.get('FILE_LIST_MAX_PAGE_SIZE', 200)
+    limit = args.get('limit', default=page_size, type=int)
+    limit = max(1, min(limit, max_page_size))
+
+    cursor = args.get('cursor')
+    if cursor:
+        try:
+            upload_date, file_id = _decode_cursor(cursor)
+        except (ValueError, UnicodeDecodeError, binascii.Error):
+            return [], None, 'Invalid cursor'
+        query = query.filter(or_(
+            File.upload_date < upload_date,
+            and_(File.upload_date == upload_date, File.id < file_id)
+        ))
+
+    rows = query.order_by(File.upload_date.desc(), File.id.desc()).limit(limit + 1).all()
+    next_cursor = _encode_cursor(rows[limit - 1]) if len(rows) > limit else None
+    return rows[:limit], next_cursor, None
+
+def _section_id(value):
+    """Returns `value` as the id of an existing section, or None if it is not one."""
+    try:
+        section_id = int(value)
+    except (TypeError, ValueError):
+        return None
+    return section_id if db.session.get(Section, section_id) else None
+
+def _create_file_record(filename, file_path, content_hash, section_id):
+    # Priority, extracted date and SLA deadline are filled in by the extraction job
+    new_file = File(
+        filename=filename,
+        file_path=file_path,
+        content_hash=content_hash,
+        section_id=section_id,
+        status='Extracting',
+        extraction_status='Queued'
+    )
+    
+    db.session.add(new_file)
+    counter_service.record_transition(section_id, None, new_file.status)
+    db.session.commit()
+    
+    submit_extraction(current_app._get_current_object(), new_file.id)
+    return new_file
+
+def _upload_response(new_file):
+    return jsonify({
+        'message': 'File uploaded successfully',
+        'file_id': new_file.id,
+        'extraction_status': new_file.extraction_status
+    }), 201
+
 @files_bp.route('/', methods=['GET'])
 @token_required
 def get_files(current_user):
     # Filter based on role
-    query = File.query.filter_by(is_deleted=False)
+    query = file_listing_query(FILE_LIST_FIELDS).filter(File.is_deleted == False)
     
     if current_user.role == 'Section Officer':
-        files = query.filter_by(section_id=current_user.section_id).order_by(File.upload_date.desc()).all()
-    else:
-        # Admin, Collector, Operator see all active files
-        files = query.order_by(File.upload_date.desc()).all()
-
-    output = []
-    for file in files:
-        file_data = {
-            'id': file.id,
-            'filename': file.filename,
-            'section': file.section_ref.name,
-            'priority': file.priority,
-            'status': file.status,
-            'upload_date': file.upload_date.isoformat() if file.upload_date else None,
-            'extracted_date': file.extracted_date.isoformat() if file.extracted_date else None,
-            'sla_deadline': file.sla_deadline.isoformat() if file.sla_deadline else None
-        }
-        output.append(file_data)
-    
-    return jsonify({'files': output})
+        query = query.filter(File.section_id == current_user.section_id)
+    # Admin, Collector, Operator see all active files
+
+    query, error = apply_listing_filters(query, request.args)
+    if error:
+        return jsonify({'message': error}), 400
+
+    files, next_cursor, error = _paginate(query, request.args)
+    if error:
+        return jsonify({'message': error}), 400
+
+    return jsonify({'files': serialize_rows(files, FILE_LIST_FIELDS), 'next_cursor': next_cursor})
 
 @files_bp.route('/<int:file_id>/delete', methods=['POST'])
 @token_required
@@ -59,9 +132,12 @@ def soft_delete_file(current_user, file_id):
     if not remarks:
         return jsonify({'message': 'Remarks are mandatory for deletion'}), 400
         
-    file.is_deleted = True
-    file.deletion_remarks = remarks
+    # Counted from the status the row has when it is deleted, not as loaded above
+    if not counter_service.move_file(file.id, {'is_deleted': True, 'deletion_remarks': remarks}):
+        db.session.rollback()
+        return jsonify({'message': 'File was changed by another request, please try again'}), 409
     db.session.commit()
+    cancel_deadline(file.id)
     
     return jsonify({'message': 'File deleted successfully'}), 200
 
@@ -69,28 +145,20 @@ def soft_delete_file(current_user, file_id):
 @token_required
 def get_deleted_files(current_user):
     # Filter based on role
-    query = File.query.filter_by(is_deleted=True)
+    query = file_listing_query(DELETED_FILE_LIST_FIELDS).filter(File.is_deleted == True)
     
     if current_user.role == 'Section Officer':
-        files = query.filter_by(section_id=current_user.section_id).order_by(File.upload_date.desc()).all()
-    else:
-        files = query.order_by(File.upload_date.desc()).all()
-
-    output = []
-    for file in files:
-        file_data = {
-            'id': file.id,
-            'filename': file.filename,
-            'section': file.section_ref.name,
-            'priority': file.priority,
-            'status': file.status,
-            'upload_date': file.upload_date.isoformat() if file.upload_date else None,
-            'extracted_date': file.extracted_date.isoformat() if file.extracted_date else None,
-            'deletion_remarks': file.deletion_remarks
-        }
-        output.append(file_data)
-    
-    return jsonify({'files': output})
+        query = query.filter(File.section_id == current_user.section_id)
+
+    query, error = apply_listing_filters(query, request.args)
+    if error:
+        return jsonify({'message': error}), 400
+
+    files, next_cursor, error = _paginate(query, request.args)
+    if error:
+        return jsonify({'message': error}), 400
+
+    return jsonify({'files': serialize_rows(files, DELETED_FILE_LIST_FIELDS), 'next_cursor': next_cursor})
 
 @files_bp.route('/upload', methods=['POST'])
 @token_required
@@ -107,41 +175,242 @@ def upload_file(current_user):
     if not section_id:
         return jsonify({'message': 'Section is required'}), 400
 
+    # Checked before the blob is stored, so a bad request leaves nothing behind
+    section_id = _section_id(section_id)
+    if section_id is None:
+        return jsonify({'message': 'Invalid section'}), 400
+
     if file and allowed_file(file.filename):
         filename = secure_filename(file.filename)
         upload_folder = current_app.config['UPLOAD_FOLDER']
-        if not os.path.exists(upload_folder):
-            os.makedirs(upload_folder)
-            
-        file_path = os.path.join(upload_folder, filename)
-        file.save(file_path)
-        
-        # Extract metadata via AI
-        metadata = extract_metadata(file_path)
-        priority = metadata.get('priority', 'Medium')
-        extracted_date = metadata.get('extracted_date')
         
-        # Calculate SLA
-        sla_days = {'Critical': 1, 'High': 3, 'Medium': 5, 'Low': 7}
-        days = sla_days.get(priority, 5)
-        sla_deadline = datetime.utcnow() + timedelta(days=days)
+        # Stored by content hash, so re-uploads of the same scan share one blob
+        content_hash, file_path, _ = store_stream(upload_folder, file.stream)
         
+        new_file = _create_file_record(filename, file_path, content_hash, section_id)
+        return _upload_response(new_file)
+    
+    return jsonify({'message': 'File type not allowed'}), 400
+
+@files_bp.route('/upload/batch', methods=['POST'])
+@token_required
+def upload_batch(current_user):
+    files = request.files.getlist('files')
+    # One section per file, or a single section_id applied to all of them
+    section_ids = request.form.getlist('section_ids')
+    default_section_id = request.form.get('section_id')
+
+    if not files:
+        return jsonify({'message': 'No file part'}), 400
+
+    max_files = current_app.config.get('BATCH_UPLOAD_MAX_FILES', 50)
+    if len(files) > max_files:
+        return jsonify({'message': f'At most {max_files} files per batch'}), 400
+
+    if section_ids and len(section_ids) != len(files):
+        return jsonify({'message': 'section_ids must match the number of files'}), 400
+
+    upload_folder = current_app.config['UPLOAD_FOLDER']
+    results = []
+    accepted = []
+
+    for index, file in enumerate(files):
+        section_id = section_ids[index] if section_ids else default_section_id
+        result = {'index': index, 'filename': file.filename}
+        results.append(result)
+
+        if file.filename == '':
+            result['error'] = 'No selected file'
+        elif not section_id:
+            result['error'] = 'Section is required'
+        elif _section_id(section_id) is None:
+            result['error'] = 'Invalid section'
+        elif not allowed_file(file.filename):
+            result['error'] = 'File type not allowed'
+        else:
+            filename = secure_filename(file.filename)
+            content_hash, file_path, _ = store_stream(upload_folder, file.stream)
+            result['filename'] = filename
+            accepted.append((result, filename, file_path, content_hash, int(section_id)))
+
+    # Extract each distinct document once, all of them concurrently
+    documents = {}
+    for _, filename, file_path, content_hash, _ in accepted:
+        documents.setdefault(content_hash, (file_path, filename, content_hash))
+    extracted = dict(zip(documents, extract_batch(current_app._get_current_object(), list(documents.values()))))
+
+    now = datetime.utcnow()
+    new_files = []
+    for result, filename, file_path, content_hash, section_id in accepted:
+        metadata, error = extracted[content_hash]
         new_file = File(
             filename=filename,
             file_path=file_path,
+            content_hash=content_hash,
             section_id=section_id,
-            priority=priority,
-            extracted_date=datetime.strptime(extracted_date, '%Y-%m-%d').date() if extracted_date else None,
-            sla_deadline=sla_deadline,
-            status='Pending'
+            upload_date=now,
+            status='Pending',
+            extraction_status='Failed' if error else 'Done'
         )
-        
-        db.session.add(new_file)
-        db.session.commit()
-        
-        return jsonify({'message': 'File uploaded successfully', 'file_id': new_file.id}), 201
+        priority = apply_metadata(new_file, metadata)
+        apply_sla(new_file, priority, now)
+        new_files.append((result, new_file))
+
+    # All rows go in with a single commit
+    db.session.add_all([new_file for _, new_file in new_files])
+    for _, new_file in new_files:
+        counter_service.record_transition(new_file.section_id, None, new_file.status)
+    db.session.commit()
+    for _, new_file in new_files:
+        notify_deadline(new_file)
+
+    for result, new_file in new_files:
+        result.update({
+            'file_id': new_file.id,
+            'priority': new_file.priority,
+            'extracted_date': new_file.extracted_date.isoformat() if new_file.extracted_date else None,
+            'sla_deadline': new_file.sla_deadline.isoformat(),
+            'extraction_status': new_file.extraction_status
+        })
+
+    return jsonify({
+        'message': f'{len(new_files)} of {len(files)} files uploaded',
+        'results': results
+    }), 201 if new_files else 400
+
+# Chunked uploads: init -> append chunks at an offset -> finalize.
+# A client that loses its connection asks for the current offset and resumes from there.
+
+def _get_upload_session(current_user, upload_id):
+    session = db.session.get(UploadSession, upload_id)
+    if not session or session.user_id != current_user.id:
+        return None
+    return session
+
+def _session_status(session):
+    return {
+        'upload_id': session.id,
+        'filename': session.filename,
+        'offset': session.received or 0,
+        'total_size': session.total_size
+    }
+
+@files_bp.route('/upload/chunked', methods=['POST'])
+@token_required
+def init_chunked_upload(current_user):
+    data = request.get_json() or {}
+    filename = data.get('filename')
+    section_id = data.get('section_id')
+    total_size = data.get('total_size')
+
+    if not filename:
+        return jsonify({'message': 'No selected file'}), 400
     
-    return jsonify({'message': 'File type not allowed'}), 400
+    if not section_id:
+        return jsonify({'message': 'Section is required'}), 400
+
+    section_id = _section_id(section_id)
+    if section_id is None:
+        return jsonify({'message': 'Invalid section'}), 400
+
+    if not allowed_file(filename):
+        return jsonify({'message': 'File type not allowed'}), 400
+
+    if total_size is not None:
+        try:
+            total_size = int(total_size)
+        except (TypeError, ValueError):
+            return jsonify({'message': 'total_size must be an integer'}), 400
+        if total_size <= 0:
+            return jsonify({'message': 'total_size must be positive'}), 400
+
+    session = UploadSession(
+        id=uuid.uuid4().hex,
+        user_id=current_user.id,
+        section_id=section_id,
+        filename=secure_filename(filename),
+        total_size=total_size,
+        received=0
+    )
+    chunked_upload.create_part(current_app.config['UPLOAD_FOLDER'], session.id)
+    
+    db.session.add(session)
+    db.session.commit()
+    
+    return jsonify(_session_status(session)), 201
+
+@files_bp.route('/upload/chunked/<upload_id>', methods=['GET'])
+@token_required
+def get_chunked_upload(current_user, upload_id):
+    session = _get_upload_session(current_user, upload_id)
+    if not session:
+        return jsonify({'message': 'Upload not found'}), 404
+    
+    return jsonify(_session_status(session))
+
+@files_bp.route('/upload/chunked/<upload_id>', methods=['PUT'])
+@token_required
+def append_chunked_upload(current_user, upload_id):
+    session = _get_upload_session(current_user, upload_id)
+    if not session:
+        return jsonify({'message': 'Upload not found'}), 404
+
+    offset = request.args.get('offset', type=int)
+    if offset is None:
+        return jsonify({'message': 'Offset is required'}), 400
+    
+    # Only appends at the current end are accepted; the client resumes from 'offset'
+    if offset != session.received:
+        return jsonify({'message': 'Offset mismatch', **_session_status(session)}), 409
+
+    try:
+        # Body is read straight from the WSGI stream, never buffered whole
+        new_offset = chunked_upload.append_chunk(
+            current_app.config['UPLOAD_FOLDER'], session.id, offset, request.stream, session.total_size
+        )
+    except ValueError as e:
+        return jsonify({'message': str(e), **_session_status(session)}), 400
+
+    session.received = new_offset
+    session.updated_at = datetime.utcnow()
+    db.session.commit()
+    
+    return jsonify(_session_status(session))
+
+@files_bp.route('/upload/chunked/<upload_id>/finalize', methods=['POST'])
+@token_required
+def finalize_chunked_upload(current_user, upload_id):
+    session = _get_upload_session(current_user, upload_id)
+    if not session:
+        return jsonify({'message': 'Upload not found'}), 404
+    
+    if not session.received:
+        return jsonify({'message': 'No data received'}), 400
+
+    if session.total_size is not None and session.received != session.total_size:
+        return jsonify({'message': 'Upload incomplete', **_session_status(session)}), 409
+
+    content_hash, file_path = chunked_upload.finish(
+        current_app.config['UPLOAD_FOLDER'], session.id, session.received
+    )
+    filename, section_id = session.filename, session.section_id
+    db.session.delete(session)
+    
+    new_file = _create_file_record(filename, file_path, content_hash, section_id)
+    return _upload_response(new_file)
+
+@files_bp.route('/upload/chunked/<upload_id>', methods=['DELETE'])
+@token_required
+def abort_chunked_upload(current_user, upload_id):
+    session = _get_upload_session(current_user, upload_id)
+    if not session:
+        return jsonify({'message': 'Upload not found'}), 404
+
+    chunked_upload.discard(current_app.config['UPLOAD_FOLDER'], session.id)
+    db.session.delete(session)
+    db.session.commit()
+    
+    return jsonify({'message': 'Upload aborted'}), 200
 
 @files_bp.route('/<int:file_id>/complete', methods=['PUT'])
 @token_required
@@ -155,14 +424,39 @@ def mark_completed(current_user, file_id):
         if current_user.role != 'Section Officer' or file.section_id != current_user.section_id:
             return jsonify({'message': 'Permission denied'}), 403
 
-    file.status = 'Completed'
-    file.completion_date = datetime.utcnow()
-    file.sla_deadline = None # Remove from SLA monitoring? Or keep for record? User req said "Remove from SLA monitoring"
-    # Actually, keep the deadline for record, but status 'Completed' excludes it from checks in scheduler
-    
+    # Remove from SLA monitoring: status 'Completed' excludes it from checks in scheduler.
+    # Counted from the status the row has when it is completed, not as loaded above
+    # (the SLA sweep may have moved it to Overdue since)
+    completed = counter_service.move_file(file.id, {
+        'status': 'Completed',
+        'completion_date': datetime.utcnow(),
+        'sla_deadline': None,
+        'sla_halfway': None
+    })
+    if not completed:
+        db.session.rollback()
+        return jsonify({'message': 'File was changed by another request, please try again'}), 409
     db.session.commit()
+    cancel_deadline(file.id)
     return jsonify({'message': 'File marked as completed'}), 200
 
+@files_bp.route('/<int:file_id>/extraction', methods=['GET'])
+@token_required
+def get_extraction_status(current_user, file_id):
+    file = File.query.get_or_404(file_id)
+    
+    if current_user.role == 'Section Officer' and file.section_id != current_user.section_id:
+        return jsonify({'message': 'Permission denied'}), 403
+
+    return jsonify({
+        'file_id': file.id,
+        'extraction_status': file.extraction_status,
+        'status': file.status,
+        'priority': file.priority,
+        'extracted_date': file.extracted_date.isoformat() if file.extracted_date else None,
+        'sla_deadline': file.sla_deadline.isoformat() if file.sla_deadline else None
+    })
+
 @files_bp.route('/<int:file_id>/view', methods=['GET'])
 @token_required
 def view_file(current_user, file_id):
@@ -176,9 +470,12 @@ def view_file(current_user, file_id):
     if current_user.role == 'Section Officer' and file.section_id != current_user.section_id:
         return jsonify({'message': 'Permission denied'}), 403
 
-    # Construct absolute path
-    # File.file_path is stored as absolute path in upload_file (os.path.join(upload_folder, filename))
-    # send_from_directory requires directory and filename
-    
     upload_folder = current_app.config['UPLOAD_FOLDER']
+    
+    # Content-addressed blobs are resolved through the hash; the original
+    # filename is only used for the download name and mimetype
+    if file.content_hash:
+        return send_file(blob_path(upload_folder, file.content_hash), download_name=file.filename)
+    
+    # Legacy uploads stored flat as UPLOAD_FOLDER/<filename>
     return send_from_directory(upload_folder, file.filename)
@@ -1,11 +1,13 @@
-from flask import Blueprint, send_file, current_app, request
-from app.models import File, Section
+from flask import Blueprint, Response, send_file, current_app, request, jsonify, stream_with_context
+from app import db
+from app.models import File, ReportJob, Section
 from app.routes.auth import token_required
-import io
-from reportlab.lib.pagesizes import letter
-from reportlab.pdfgen import canvas
-from reportlab.lib import colors
+from app.services.report_service import get_daily_report
+from app.services.report_job_service import create_job, submit_job, serialize_job
+from app.services.listing_service import file_listing_query, apply_listing_filters
+from app.services.export_service import EXPORT_FIELDS, FORMATS, iter_export, gzip_stream
 from datetime import datetime
+import os
 
 reports_bp = Blueprint('reports', __name__)
 
@@ -15,91 +17,91 @@ def generate_daily_report(current_user):
     # Only Admin or Collector or Section Officer can generate?
     # For now, allow logged in users
     view_inline = request.args.get('view') == 'true'
-    
-    buffer = io.BytesIO()
-    p = canvas.Canvas(buffer, pagesize=letter)
-    width, height = letter
-    
-    # Title
-    p.setFillColor(colors.darkblue)
-    p.setFont("Helvetica-Bold", 18)
-    p.drawString(50, height - 50, f"Daily File Status Report")
-    p.setFont("Helvetica", 12)
-    p.setFillColor(colors.black)
-    p.drawString(50, height - 70, f"Date: {datetime.utcnow().strftime('%Y-%m-%d')}")
-    
-    # Stats
-    total = File.query.count()
-    pending = File.query.filter_by(status='Pending').count()
-    completed = File.query.filter_by(status='Completed').count()
-    overdue = File.query.filter_by(status='Overdue').count()
-    
-    y = height - 120
-    
-    # Draw colored stats
-    # Total
-    p.setFont("Helvetica-Bold", 14)
-    p.setFillColor(colors.blue)
-    p.drawString(50, y, f"Total: {total}")
-    
-    # Completed
-    p.setFillColor(colors.green)
-    p.drawString(200, y, f"Completed: {completed}")
-
-    # Pending
-    p.setFillColor(colors.orange)
-    p.drawString(350, y, f"Pending: {pending}")
-
-    # Overdue
-    p.setFillColor(colors.red)
-    p.drawString(500, y, f"Overdue: {overdue}")
-    
-    y -= 20
-    p.setStrokeColor(colors.lightgrey)
-    p.line(50, y, 550, y)
-    
-    # Section Breakdown
-    y -= 40
-    p.setFillColor(colors.black)
-    p.setFont("Helvetica-Bold", 14)
-    p.drawString(50, y, "Section Breakdown")
-    y -= 30
-    
-    sections = Section.query.all()
-    p.setFont("Helvetica", 11)
-    
-    for section in sections:
-        s_total = File.query.filter_by(section_id=section.id).count()
-        s_pending = File.query.filter_by(section_id=section.id, status='Pending').count()
-        s_completed = File.query.filter_by(section_id=section.id, status='Completed').count()
-        s_overdue = File.query.filter_by(section_id=section.id, status='Overdue').count()
-        
-        # Section Name
-        p.setFillColor(colors.black)
-        p.setFont("Helvetica-Bold", 11)
-        p.drawString(60, y, f"Section: {section.name}")
-        
-        # Stats for section
-        p.setFont("Helvetica", 10)
-        p.setFillColor(colors.blue)
-        p.drawString(200, y, f"Total: {s_total}")
-        
-        p.setFillColor(colors.green)
-        p.drawString(280, y, f"Completed: {s_completed}")
-        
-        p.setFillColor(colors.orange)
-        p.drawString(380, y, f"Pending: {s_pending}")
-        
-        p.setFillColor(colors.red)
-        p.drawString(470, y, f"Overdue: {s_overdue}")
-        
-        y -= 25
-        if y < 50:
-            p.showPage()
-            y = height - 50
-            
-    p.showPage()
-    p.save()
-    
-    buffer.seek(0)
-    return send_file(buffer, as_attachment=not view_inline, download_name='daily_report.pdf', mimetype='application/pdf')
+    # ?refresh=true re-renders the report even if the counts have not changed
+    force = request.args.get('refresh') == 'true' and current_user.role in ['Admin', 'Collector']
+
+    # Rendered by the scheduler into a dated on-disk cache; this is normally a plain file read.
+    # send_file answers If-None-Match / If-Modified-Since with 304.
+    path = get_daily_report(current_app._get_current_object(), force=force)
+    etag = os.path.splitext(os.path.basename(path))[0]
+    return send_file(path, as_attachment=not view_inline, download_name='daily_report.pdf',
+                     mimetype='application/pdf', etag=etag, max_age=0)
+
+# Detailed reports run as background jobs: submit -> poll status -> download
+
+def _get_job(current_user, job_id):
+    job = ReportJob.query.get_or_404(job_id)
+    if job.user_id != current_user.id and current_user.role != 'Admin':
+        return None
+    return job
+
+@reports_bp.route('/jobs', methods=['POST'])
+@token_required
+def submit_report_job(current_user):
+    data = request.get_json(silent=True) or {}
+    # Users tied to a section only get their own section
+    section_id = current_user.section_id or data.get('section_id')
+    if section_id and not db.session.get(Section, section_id):
+        return jsonify({'message': 'Section not found'}), 404
+
+    job = create_job(current_user, section_id)
+    submit_job(current_app._get_current_object(), job.id)
+    return jsonify(serialize_job(job)), 202
+
+@reports_bp.route('/jobs/<job_id>', methods=['GET'])
+@token_required
+def get_report_job(current_user, job_id):
+    job = _get_job(current_user, job_id)
+    if not job:
+        return jsonify({'message': 'Permission denied'}), 403
+    return jsonify(serialize_job(job)), 200
+
+@reports_bp.route('/jobs/<job_id>/download', methods=['GET'])
+@token_required
+def download_report_job(current_user, job_id):
+    job = _get_job(current_user, job_id)
+    if not job:
+        return jsonify({'message': 'Permission denied'}), 403
+    if job.status != 'Done':
+        return jsonify({'message': f'Report is not ready (status: {job.status})'}), 409
+
+    view_inline = request.args.get('view') == 'true'
+    return send_file(job.file_path, as_attachment=not view_inline,
+                     download_name=f'detailed_report_{job.created_at.strftime("%Y-%m-%d")}.pdf',
+                     mimetype='application/pdf')
+
+@reports_bp.route('/export', methods=['GET'])
+@token_required
+def export_files(current_user):
+    """
+    Streams every matching file record as CSV (default) or NDJSON
+    (?format=ndjson). Accepts the same filters as the file listing, including
+    date_from/date_to on the upload date. Rows are read yield_per chunks at a
+    time and compressed on the fly for clients that accept gzip, so memory
+    use does not grow with the size of the export.
+    """
+    fmt = request.args.get('format', 'csv')
+    if fmt not in FORMATS:
+        return jsonify({'message': f"format must be one of: {', '.join(FORMATS)}"}), 400
+
+    query = file_listing_query(EXPORT_FIELDS).filter(File.is_deleted == False)
+    if current_user.role == 'Section Officer':
+        query = query.filter(File.section_id == current_user.section_id)
+
+    query, error = apply_listing_filters(query, request.args)
+    if error:
+        return jsonify({'message': error}), 400
+
+    rows = query.order_by(File.upload_date, File.id).yield_per(current_app.config.get('EXPORT_CHUNK_SIZE', 1000))
+    body = iter_export(rows, fmt)
+
+    mimetype, extension = FORMATS[fmt]
+    headers = {
+        'Content-Disposition': f'attachment; filename=files_export_{datetime.utcnow().strftime("%Y-%m-%d")}.{extension}',
+        'Vary': 'Accept-Encoding'
+    }
+    if 'gzip' in request.accept_encodings:
+        body = gzip_stream(body)
+        headers['Content-Encoding'] = 'gzip'
+
+    return Response(stream_with_context(body), mimetype=mimetype, headers=headers)
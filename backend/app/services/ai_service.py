@@ -1,115 +1,37 @@
-import os
-import google.generativeai as genai
-from flask import current_app
-import json
-import re
-from datetime import datetime
+from app.services.blob_store import hash_file
+from app.services.extractors import get_chain
 
-def extract_metadata(file_path):
+def extract_metadata(file_path, filename=None, content_hash=None):
     """
-    Extracts metadata from the given file using Gemini API.
+    Extracts metadata from the given file by running the configured extractor
+    backends (EXTRACTOR_BACKENDS) in order.
+    `filename` is the original upload name; it decides the file type when
+    the stored path carries no extension (content-addressed blobs).
+    Each backend only fills fields still missing, and the chain stops as soon
+    as a date has been found.
     Returns a dictionary with extracted_date and priority.
     """
-    api_key = current_app.config.get('GEMINI_API_KEY')
-    if not api_key:
-        print("Gemini API Key not found.")
-        return {'extracted_date': None, 'priority': 'Medium'}
+    content_hash = content_hash or hash_file(file_path)
+    extracted_data = {'extracted_date': None, 'priority': None}
 
-    extracted_data = {'extracted_date': None, 'priority': 'Medium'}
-    
-    try:
-        genai.configure(api_key=api_key)
-        # Use a model that is available in the list
-        model = genai.GenerativeModel('gemini-2.0-flash')
-        
-        print(f"Uploading file to Gemini: {file_path}")
-        # Upload the file to Gemini
-        sample_file = genai.upload_file(path=file_path, display_name="Uploaded File")
-        
-        prompt = """
-        Extract the following information from the document:
-        1. Complaint/Document Date. Return in YYYY-MM-DD format only. If the date is in DD-MM-YYYY or other formats, convert it to YYYY-MM-DD.
-        2. Priority (Low, Medium, High, Critical) based on the content urgency.
-        
-        Output valid JSON only: {"extracted_date": "YYYY-MM-DD", "priority": "Level"}
-        """
-        
-        response = model.generate_content([sample_file, prompt])
-        print(f"Gemini response: {response.text}")
-        
-        text = response.text
-        # Clean up markdown code blocks if present
-        text = text.replace('```json', '').replace('```', '')
-        
-        # Find JSON substring
-        match = re.search(r'\{.*\}', text, re.DOTALL)
-        if match:
-            json_str = match.group(0)
-            try:
-                data = json.loads(json_str)
-                extracted_data['priority'] = data.get('priority', 'Medium')
-                
-                # Validate and normalize date
-                date_str = data.get('extracted_date')
-                if date_str:
-                    # Try to parse and re-format to ensure YYYY-MM-DD
-                    # Support various potential formats returned by AI
-                    for fmt in ('%Y-%m-%d', '%d-%m-%Y', '%d/%m/%Y', '%m-%d-%Y', '%m/%d/%Y'):
-                         try:
-                             dt = datetime.strptime(date_str, fmt)
-                             extracted_data['extracted_date'] = dt.strftime('%Y-%m-%d')
-                             break
-                         except ValueError:
-                             continue
-            except json.JSONDecodeError:
-                print(f"Failed to decode JSON: {json_str}")
-    except Exception as e:
-        print(f"Error in AI extraction or API call: {e}")
-        # Continue to fallback
-        
-    # Fallback if date is None
-    if not extracted_data.get('extracted_date'):
-        print("Trying Regex fallback on local file content...")
+    for backend in get_chain():
         try:
-            content = ""
-            ext = os.path.splitext(file_path)[1].lower()
-            
-            if ext == '.txt':
-                with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-                    content = f.read()
-            elif ext == '.pdf':
-                import PyPDF2
-                with open(file_path, 'rb') as f:
-                    reader = PyPDF2.PdfReader(f)
-                    for page in reader.pages:
-                        content += page.extract_text() + "\n"
-            
-            # Regex for various date formats with flexible whitespace
-            # Matches YYYY -MM -DD, DD -MM -YYYY, DD / MM / YYYY
-            date_patterns = [
-                r'\b(\d{4})\s*-\s*(\d{1,2})\s*-\s*(\d{1,2})\b', # YYYY-MM-DD with spaces
-                r'\b(\d{1,2})\s*-\s*(\d{1,2})\s*-\s*(\d{4})\b', # DD-MM-YYYY with spaces
-                r'\b(\d{1,2})\s*/\s*(\d{1,2})\s*/\s*(\d{4})\b'  # DD/MM/YYYY with spaces
-            ]
-            
-            found_date = None
-            for pattern in date_patterns:
-                match = re.search(pattern, content)
-                if match:
-                    groups = match.groups()
-                    if len(groups[0]) == 4: # YYYY-MM-DD
-                        found_date = f"{groups[0]}-{groups[1].zfill(2)}-{groups[2].zfill(2)}"
-                    else: # DD-MM-YYYY or DD/MM/YYYY -> assume DD-MM-YYYY
-                        found_date = f"{groups[2]}-{groups[1].zfill(2)}-{groups[0].zfill(2)}"
-                    break
-            
-            if found_date:
-                 extracted_data['extracted_date'] = found_date
-                 print(f"Regex fallback found: {found_date}")
-            else:
-                 print("Regex fallback failed to find a date.")
-                 
+            data = backend.extract(file_path, filename, content_hash)
         except Exception as e:
-             print(f"Error in local fallback extraction: {e}")
+            print(f"Error in {backend.name} extraction: {e}")
+            continue
+
+        if not data:
+            continue
+
+        for key in extracted_data:
+            if not extracted_data[key] and data.get(key):
+                extracted_data[key] = data[key]
+
+        if extracted_data['extracted_date']:
+            break
+
+    if not extracted_data['priority']:
+        extracted_data['priority'] = 'Medium'
 
     return extracted_data
@@ -0,0 +1,81 @@
+from datetime import datetime
+from sqlalchemy import func, literal
+from app import db
+from app.models import File
+from app.services.listing_service import file_listing_query
+
+ALERT_FIELDS = ['id', 'filename', 'section', 'upload_date', 'sla_deadline', 'priority']
+
+def epoch_seconds(column):
+    """
+    Seconds since the Unix epoch for a DateTime column, in the current database's dialect.
+    """
+    dialect = db.engine.dialect.name
+    if dialect == 'sqlite':
+        return (func.julianday(column) - 2440587.5) * 86400.0
+    if dialect in ('mysql', 'mariadb'):
+        return func.unix_timestamp(column)
+    return func.extract('epoch', column)
+
+def sla_alerts_query(now, section_id=None, threshold=0.5, limit=100):
+    """
+    Query for pending files that have used more than `threshold` of their SLA
+    window at `now`, most urgent first, at most `limit` of them.
+    """
+    upload = epoch_seconds(File.upload_date)
+    deadline = epoch_seconds(File.sla_deadline)
+    now_seconds = epoch_seconds(literal(now, File.upload_date.type))
+
+    query = file_listing_query(ALERT_FIELDS).filter(
+        File.status == 'Pending',
+        File.is_deleted == False,
+        File.sla_deadline > File.upload_date
+    )
+
+    if section_id:
+        query = query.filter(File.section_id == section_id)
+
+    if threshold >= 0.5:
+        # Anything past `threshold` is past halfway: narrow with the indexed column first
+        query = query.filter(File.sla_halfway < now)
+    if threshold != 0.5:
+        query = query.filter(upload + threshold * (deadline - upload) < now_seconds)
+
+    urgency = (now_seconds - upload) / (deadline - upload)
+    return query.order_by(urgency.desc(), File.id).limit(limit)
+
+def get_sla_alerts(section_id=None, threshold=0.5, limit=100):
+    """
+    Alert rows for the dashboard. Filtering, ordering and the limit all run
+    in SQL, so only the returned rows are loaded.
+    """
+    now = datetime.utcnow()
+    rows = sla_alerts_query(now, section_id, threshold, limit).all()
+
+    alerts = []
+    for file in rows:
+        total_sla_duration = (file.sla_deadline - file.upload_date).total_seconds()
+        elapsed_duration = (now - file.upload_date).total_seconds()
+
+        # Calculate percentage for UI
+        percentage = min(100, int((elapsed_duration / total_sla_duration) * 100))
+        time_left = file.sla_deadline - now
+
+        # Format time left friendly
+        days = time_left.days
+        hours = time_left.seconds // 3600
+        time_left_str = f"{days}d {hours}h" if days > 0 else f"{hours}h"
+        if time_left.total_seconds() < 0:
+            time_left_str = "Overdue"
+
+        alerts.append({
+            'id': file.id,
+            'filename': file.filename,
+            'section': file.section,
+            'upload_date': file.upload_date.strftime('%Y-%m-%d'),
+            'sla_deadline': file.sla_deadline.strftime('%Y-%m-%d'),
+            'percentage': percentage,
+            'time_left': time_left_str,
+            'priority': file.priority
+        })
+    return alerts
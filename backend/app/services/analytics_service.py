@@ -0,0 +1,114 @@
+from datetime import datetime
+import numpy as np
+from sqlalchemy import select
+from app import db
+from app.models import File, Section
+from app.services.alert_service import epoch_seconds
+from app.services.sla_service import SLA_DAYS
+
+# Age past the deadline of files still Overdue, in days: [0, 1), [1, 3), [3, 7), 7+
+AGEING_EDGES = [1, 3, 7]
+AGEING_LABELS = ['<1d', '1-3d', '3-7d', '7d+']
+PRIORITIES = list(SLA_DAYS)
+DAY = 86400.0
+
+def load_columns(section_id=None, chunk_size=5000):
+    """
+    Reads the non-deleted files as NumPy arrays, one per column. Dates come
+    back from the database as epoch seconds (NaN when NULL), so no datetime
+    or ORM objects are built per row.
+    """
+    query = select(
+        epoch_seconds(File.upload_date),
+        epoch_seconds(File.sla_deadline),
+        epoch_seconds(File.completion_date),
+        File.priority,
+        File.section_id,
+        File.status
+    ).where(File.is_deleted == False)
+    if section_id:
+        query = query.where(File.section_id == section_id)
+
+    chunks = []
+    result = db.session.execute(query.execution_options(yield_per=chunk_size))
+    for rows in result.partitions():
+        upload, deadline, completion, priority, section, status = zip(*rows)
+        chunks.append((
+            np.array(upload, dtype=float),
+            np.array(deadline, dtype=float),
+            np.array(completion, dtype=float),
+            np.array([PRIORITIES.index(p) if p in SLA_DAYS else -1 for p in priority], dtype=np.int8),
+            np.array(section, dtype=np.int64),
+            np.array([s == 'Overdue' for s in status], dtype=bool),
+        ))
+
+    names = ('upload', 'deadline', 'completion', 'priority', 'section', 'overdue')
+    if not chunks:
+        empty = (float, float, float, np.int8, np.int64, bool)
+        return {name: np.empty(0, dtype=dtype) for name, dtype in zip(names, empty)}
+    return {name: np.concatenate([chunk[i] for chunk in chunks]) for i, name in enumerate(names)}
+
+def _effective_deadline(columns):
+    """
+    Completing a file clears its sla_deadline, so for those rows the deadline
+    is recomputed as upload_date + SLA_DAYS[priority], as apply_sla set it.
+    """
+    sla_seconds = np.array([SLA_DAYS[p] * DAY for p in PRIORITIES] + [np.nan])
+    recomputed = columns['upload'] + sla_seconds[columns['priority']] # -1 (unknown) picks NaN
+    return np.where(np.isnan(columns['deadline']), recomputed, columns['deadline'])
+
+def _round(value, digits=1):
+    return None if value is None or np.isnan(value) else round(float(value), digits)
+
+def _group_stats(mask, columns, deadline, now):
+    completed = mask & ~np.isnan(columns['completion'])
+    turnaround = (columns['completion'][completed] - columns['upload'][completed]) / 3600.0
+
+    judged = completed & ~np.isnan(deadline)
+    hits = columns['completion'][judged] <= deadline[judged]
+
+    overdue = mask & columns['overdue']
+    age_days = (now - deadline[overdue]) / DAY
+    ageing = np.bincount(np.searchsorted(AGEING_EDGES, age_days[~np.isnan(age_days)], side='right'),
+                         minlength=len(AGEING_LABELS))
+
+    median, p90 = np.percentile(turnaround, [50, 90]) if turnaround.size else (None, None)
+    return {
+        'files': int(mask.sum()),
+        'completed': int(completed.sum()),
+        'median_turnaround_hours': _round(median),
+        'p90_turnaround_hours': _round(p90),
+        'sla_hit_rate': _round(hits.mean(), 3) if hits.size else None,
+        'overdue': int(overdue.sum()),
+        'overdue_ageing': dict(zip(AGEING_LABELS, ageing.tolist()))
+    }
+
+def get_analytics(section_id=None, now=None):
+    """
+    Turnaround and SLA compliance, overall and per section and priority:
+    median/p90 completion time, share of completed files finished by their
+    deadline, and how long overdue files have been overdue.
+    """
+    now = (now or datetime.utcnow())
+    now_seconds = (now - datetime(1970, 1, 1)).total_seconds()
+    columns = load_columns(section_id)
+    deadline = _effective_deadline(columns)
+    everything = np.ones(columns['upload'].shape, dtype=bool)
+
+    sections_query = Section.query.order_by(Section.id)
+    if section_id:
+        sections_query = sections_query.filter_by(id=section_id)
+
+    return {
+        'generated_at': now.isoformat(),
+        'overall': _group_stats(everything, columns, deadline, now_seconds),
+        'sections': [
+            {'id': section.id, 'name': section.name,
+             **_group_stats(columns['section'] == section.id, columns, deadline, now_seconds)}
+            for section in sections_query
+        ],
+        'priorities': [
+            {'priority': priority, **_group_stats(columns['priority'] == code, columns, deadline, now_seconds)}
+            for code, priority in enumerate(PRIORITIES)
+        ]
+    }
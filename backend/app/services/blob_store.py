@@ -0,0 +1,70 @@
+import hashlib
+import os
+import tempfile
+
+# Read/write size used while streaming uploads to disk
+CHUNK_SIZE = 1024 * 1024
+
+def blob_path(upload_folder, content_hash):
+    """
+    Returns the sharded on-disk location of a blob: <upload_folder>/ab/cd/<sha256>.
+    """
+    return os.path.join(upload_folder, content_hash[:2], content_hash[2:4], content_hash)
+
+def temp_dir(upload_folder):
+    """
+    Scratch directory for in-flight uploads. It lives inside the upload folder
+    so finished blobs can be moved into place with an atomic rename.
+    """
+    path = os.path.join(upload_folder, 'tmp')
+    os.makedirs(path, exist_ok=True)
+    return path
+
+def commit_temp_file(upload_folder, tmp_path, content_hash):
+    """
+    Moves a fully written temp file to its content-addressed location.
+    If the blob already exists the temp file is discarded, so identical
+    uploads share a single copy on disk.
+    """
+    path = blob_path(upload_folder, content_hash)
+    if os.path.exists(path):
+        os.remove(tmp_path)
+    else:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        os.replace(tmp_path, path)
+    return path
+
+def store_stream(upload_folder, stream):
+    """
+    Writes a readable binary stream to the blob store, hashing it on the way.
+    Returns (content_hash, path, size).
+    """
+    hasher = hashlib.sha256()
+    size = 0
+    fd, tmp_path = tempfile.mkstemp(dir=temp_dir(upload_folder))
+    try:
+        with os.fdopen(fd, 'wb') as out:
+            while True:
+                chunk = stream.read(CHUNK_SIZE)
+                if not chunk:
+                    break
+                hasher.update(chunk)
+                out.write(chunk)
+                size += len(chunk)
+    except Exception:
+        os.remove(tmp_path)
+        raise
+
+    content_hash = hasher.hexdigest()
+    path = commit_temp_file(upload_folder, tmp_path, content_hash)
+    return content_hash, path, size
+
+def hash_file(path):
+    """
+    Returns the SHA-256 hex digest of a file on disk.
+    """
+    hasher = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(CHUNK_SIZE), b''):
+            hasher.update(chunk)
+    return hasher.hexdigest()
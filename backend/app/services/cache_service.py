@@ -0,0 +1,179 @@
+import json
+import threading
+import time
+from flask import current_app, has_app_context
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+class CacheBackend:
+    """
+    Storage for cached results. Values must be JSON-serialisable so that
+    shared backends can store them.
+    """
+    def get(self, key):
+        """Returns (hit, value)."""
+        raise NotImplementedError
+
+    def set(self, key, value, ttl):
+        raise NotImplementedError
+
+    def delete_prefix(self, prefix):
+        raise NotImplementedError
+
+class MemoryCacheBackend(CacheBackend):
+    """
+    In-process store. Each worker process has its own copy, so a write in one
+    worker only becomes visible to the others when their entries expire.
+    """
+    def __init__(self, app=None):
+        self._data = {}
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return False, None
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._data[key]
+                return False, None
+            return True, value
+
+    def set(self, key, value, ttl):
+        with self._lock:
+            self._data[key] = (time.monotonic() + ttl, value)
+
+    def delete_prefix(self, prefix):
+        with self._lock:
+            for key in [key for key in self._data if key.startswith(prefix)]:
+                del self._data[key]
+
+class RedisCacheBackend(CacheBackend):
+    """
+    Shared store for multi-worker deployments (CACHE_REDIS_URL). Needs the
+    optional `redis` package.
+    """
+    def __init__(self, app):
+        import redis
+        self._client = redis.Redis.from_url(app.config['CACHE_REDIS_URL'])
+        self._namespace = 'filets:'
+
+    def get(self, key):
+        raw = self._client.get(self._namespace + key)
+        if raw is None:
+            return False, None
+        return True, json.loads(raw)
+
+    def set(self, key, value, ttl):
+        self._client.setex(self._namespace + key, max(1, int(round(ttl))), json.dumps(value))
+
+    def delete_prefix(self, prefix):
+        keys = list(self._client.scan_iter(match=self._namespace + prefix + '*'))
+        if keys:
+            self._client.delete(*keys)
+
+BACKENDS = {
+    'memory': MemoryCacheBackend,
+    'redis': RedisCacheBackend
+}
+
+class _InFlight:
+    def __init__(self):
+        self.done = threading.Event()
+        self.value = None
+        self.error = None
+
+class ResultCache:
+    """
+    TTL cache in front of expensive computations. Concurrent misses on the same
+    key are coalesced: one caller computes, the others wait for its result.
+    """
+    def __init__(self, backend, default_ttl=30):
+        self.backend = backend
+        self.default_ttl = default_ttl
+        self._inflight = {}
+        self._lock = threading.Lock()
+        self._stats = {'hits': 0, 'misses': 0, 'coalesced': 0, 'invalidations': 0}
+
+    def _count(self, key):
+        with self._lock:
+            self._stats[key] += 1
+
+    def get_or_compute(self, key, compute, ttl=None):
+        hit, value = self.backend.get(key)
+        if hit:
+            self._count('hits')
+            return value
+
+        with self._lock:
+            call = self._inflight.get(key)
+            leader = call is None
+            if leader:
+                call = self._inflight[key] = _InFlight()
+
+        if not leader:
+            self._count('coalesced')
+            call.done.wait()
+            if call.error:
+                raise call.error
+            return call.value
+
+        self._count('misses')
+        try:
+            call.value = compute()
+            self.backend.set(key, call.value, ttl or self.default_ttl)
+            return call.value
+        except Exception as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+            call.done.set()
+
+    def invalidate(self, prefix=''):
+        self.backend.delete_prefix(prefix)
+        self._count('invalidations')
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self._stats)
+        lookups = stats['hits'] + stats['misses'] + stats['coalesced']
+        stats['hit_rate'] = round((stats['hits'] + stats['coalesced']) / lookups, 4) if lookups else 0.0
+        return stats
+
+_cache = None
+_cache_lock = threading.Lock()
+
+def get_cache(app=None):
+    """
+    Returns the process-wide ResultCache, built from DASHBOARD_CACHE_BACKEND on first use.
+    """
+    global _cache
+    app = app or current_app
+    with _cache_lock:
+        if _cache is None:
+            backend_name = app.config.get('DASHBOARD_CACHE_BACKEND', 'memory')
+            if backend_name not in BACKENDS:
+                raise ValueError(f"Unknown cache backend: {backend_name}")
+            _cache = ResultCache(BACKENDS[backend_name](app), app.config.get('DASHBOARD_CACHE_TTL', 30))
+        return _cache
+
+def dashboard_key(endpoint, section_id):
+    return f"dashboard:{endpoint}:{section_id or 'all'}"
+
+def mark_dashboard_dirty(session):
+    """
+    Flags the session so dashboard entries are invalidated once it commits.
+    """
+    session.info['dashboard_dirty'] = True
+
+@event.listens_for(Session, 'after_commit')
+def _invalidate_after_commit(session):
+    if session.info.pop('dashboard_dirty', False) and has_app_context():
+        get_cache().invalidate('dashboard:')
+
+@event.listens_for(Session, 'after_rollback')
+def _discard_after_rollback(session):
+    session.info.pop('dashboard_dirty', None)
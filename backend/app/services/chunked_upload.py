@@ -0,0 +1,127 @@
+import hashlib
+import os
+import threading
+from datetime import datetime, timedelta
+from sqlalchemy import delete
+from app import db
+from app.models import UploadSession
+from app.services.blob_store import CHUNK_SIZE, temp_dir, commit_temp_file
+
+# Running SHA-256 state per upload session: upload_id -> (offset, hasher).
+# This is only an optimisation; if a session lands on another process or the
+# state is lost, the hash is rebuilt from the part file on disk.
+_hashers = {}
+_locks = {}
+_registry_lock = threading.Lock()
+
+def _lock_for(upload_id):
+    with _registry_lock:
+        return _locks.setdefault(upload_id, threading.Lock())
+
+def _forget(upload_id):
+    with _registry_lock:
+        _hashers.pop(upload_id, None)
+        _locks.pop(upload_id, None)
+
+def part_path(upload_folder, upload_id):
+    return os.path.join(temp_dir(upload_folder), f"{upload_id}.part")
+
+def _hasher_at(path, upload_id, offset):
+    state = _hashers.get(upload_id)
+    if state and state[0] == offset:
+        return state[1]
+
+    hasher = hashlib.sha256()
+    remaining = offset
+    if remaining:
+        with open(path, 'rb') as f:
+            while remaining:
+                chunk = f.read(min(CHUNK_SIZE, remaining))
+                if not chunk:
+                    break
+                hasher.update(chunk)
+                remaining -= len(chunk)
+    return hasher
+
+def create_part(upload_folder, upload_id):
+    open(part_path(upload_folder, upload_id), 'wb').close()
+
+def append_chunk(upload_folder, upload_id, offset, stream, max_size=None):
+    """
+    Writes the stream to the part file starting at `offset`, hashing as it goes.
+    Anything past `offset` left by an interrupted request is overwritten.
+    Returns the new offset. Raises ValueError if the upload would exceed max_size.
+    """
+    path = part_path(upload_folder, upload_id)
+    with _lock_for(upload_id):
+        hasher = _hasher_at(path, upload_id, offset)
+        position = offset
+        try:
+            with open(path, 'r+b') as out:
+                out.seek(offset)
+                out.truncate()
+                while True:
+                    chunk = stream.read(CHUNK_SIZE)
+                    if not chunk:
+                        break
+                    position += len(chunk)
+                    if max_size is not None and position > max_size:
+                        raise ValueError('Chunk exceeds declared upload size')
+                    hasher.update(chunk)
+                    out.write(chunk)
+        except Exception:
+            # Partial chunk: the hash no longer matches any committed offset
+            _hashers.pop(upload_id, None)
+            raise
+
+        _hashers[upload_id] = (position, hasher)
+        return position
+
+def finish(upload_folder, upload_id, size):
+    """
+    Moves a completed part file into the blob store.
+    Returns (content_hash, path).
+    """
+    path = part_path(upload_folder, upload_id)
+    with _lock_for(upload_id):
+        hasher = _hasher_at(path, upload_id, size)
+        with open(path, 'r+b') as f:
+            f.truncate(size)
+        content_hash = hasher.hexdigest()
+        blob = commit_temp_file(upload_folder, path, content_hash)
+    _forget(upload_id)
+    return content_hash, blob
+
+def discard(upload_folder, upload_id):
+    path = part_path(upload_folder, upload_id)
+    if os.path.exists(path):
+        os.remove(path)
+    _forget(upload_id)
+
+def expire_sessions(app):
+    """
+    Scheduler job: deletes upload sessions nobody has appended to for
+    UPLOAD_SESSION_MAX_AGE_HOURS, with their part files. Each row is deleted
+    under the same age check, so a session resumed in the meantime is kept.
+    Returns the number of sessions expired.
+    """
+    with app.app_context():
+        upload_folder = app.config['UPLOAD_FOLDER']
+        cutoff = datetime.utcnow() - timedelta(hours=app.config.get('UPLOAD_SESSION_MAX_AGE_HOURS', 24))
+        stale = [row.id for row in db.session.query(UploadSession.id).filter(UploadSession.updated_at < cutoff)]
+
+        expired = 0
+        for upload_id in stale:
+            deleted = db.session.execute(
+                delete(UploadSession)
+                .where(UploadSession.id == upload_id, UploadSession.updated_at < cutoff)
+                .execution_options(synchronize_session=False)
+            ).rowcount
+            db.session.commit()
+            if deleted:
+                discard(upload_folder, upload_id)
+                expired += 1
+
+    if expired:
+        print(f"Expired {expired} abandoned chunked upload(s)")
+    return expired
@@ -0,0 +1,111 @@
+from sqlalchemy import func, update
+from sqlalchemy.exc import IntegrityError
+from app import db
+from app.models import File, SectionStatusCount
+from app.services.cache_service import mark_dashboard_dirty
+
+def adjust(section_id, status, delta):
+    """
+    Adds `delta` to the counter for (section_id, status) in the current
+    transaction. Does not commit.
+    """
+    if not delta:
+        return
+    # Any counted change also changes what the dashboard shows
+    mark_dashboard_dirty(db.session())
+    section_id = int(section_id)
+    table = SectionStatusCount.__table__
+    updated = db.session.execute(
+        table.update()
+        .where(table.c.section_id == section_id, table.c.status == status)
+        .values(count=table.c.count + delta)
+    ).rowcount
+    if updated:
+        return
+
+    try:
+        with db.session.begin_nested():
+            db.session.execute(table.insert().values(section_id=section_id, status=status, count=delta))
+    except IntegrityError:
+        # Row was created concurrently; apply the delta to it
+        db.session.execute(
+            table.update()
+            .where(table.c.section_id == section_id, table.c.status == status)
+            .values(count=table.c.count + delta)
+        )
+
+def record_transition(section_id, old_status, new_status, count=1):
+    """
+    Moves `count` files from old_status to new_status. Use None for old_status
+    when files are created and for new_status when they are deleted.
+    """
+    if old_status == new_status:
+        return
+    if old_status:
+        adjust(section_id, old_status, -count)
+    if new_status:
+        adjust(section_id, new_status, count)
+
+def move_file(file_id, values, attempts=5):
+    """
+    Applies `values` to one file and adjusts the counters in the same
+    transaction, from the status the row really had when it changed. The
+    UPDATE only matches the status and is_deleted just read, so if something
+    else (e.g. the SLA sweep) changed them first it reads the row again and
+    retries. Does not commit. Returns False if the file is gone or kept
+    changing for `attempts` tries.
+    """
+    for _ in range(attempts):
+        row = db.session.query(File.section_id, File.status, File.is_deleted) \
+            .filter(File.id == file_id).one_or_none()
+        if row is None:
+            return False
+
+        updated = db.session.execute(
+            update(File)
+            .where(File.id == file_id, File.status == row.status, File.is_deleted == row.is_deleted)
+            .values(**values)
+            .execution_options(synchronize_session=False)
+        ).rowcount
+        if updated:
+            old_status = None if row.is_deleted else row.status
+            new_status = None if values.get('is_deleted', row.is_deleted) else values.get('status', row.status)
+            record_transition(row.section_id, old_status, new_status)
+            return True
+    return False
+
+def file_counts_query():
+    """(section_id, status, count) of the non-deleted files, as counted by rebuild and verify."""
+    return db.session.query(File.section_id, File.status, func.count(File.id)) \
+        .filter(File.is_deleted == False) \
+        .group_by(File.section_id, File.status)
+
+def counts_from_files():
+    """
+    Recomputes {(section_id, status): count} from the file table.
+    """
+    return {(section_id, status): count for section_id, status, count in file_counts_query()}
+
+def verify():
+    """
+    Compares the counters with the file table.
+    Returns a list of (section_id, status, stored, actual) for every mismatch.
+    """
+    actual = counts_from_files()
+    stored = {(row.section_id, row.status): row.count for row in SectionStatusCount.query}
+    mismatches = []
+    for key in sorted(set(actual) | set(stored), key=lambda k: (k[0], k[1] or '')):
+        if stored.get(key, 0) != actual.get(key, 0):
+            mismatches.append((key[0], key[1], stored.get(key, 0), actual.get(key, 0)))
+    return mismatches
+
+def rebuild():
+    """
+    Replaces the counters with fresh counts from the file table and commits.
+    """
+    SectionStatusCount.query.delete()
+    db.session.add_all([
+        SectionStatusCount(section_id=section_id, status=status, count=count)
+        for (section_id, status), count in counts_from_files().items()
+    ])
+    db.session.commit()
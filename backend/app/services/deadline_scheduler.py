@@ -0,0 +1,106 @@
+import heapq
+import threading
+from datetime import datetime
+
+class DeadlineScheduler:
+    """
+    Keeps a min-heap of (instant, key, kind) entries and calls `on_due` from a
+    background thread as soon as the earliest instant has passed. The thread
+    sleeps on a condition until then, so nothing runs while no deadline is due.
+
+    Entries are invalidated lazily: `schedule` and `cancel` update the current
+    deadline per key, and popped entries that no longer match it are dropped.
+    A key is forgotten once its last instant has been popped.
+    """
+
+    def __init__(self, on_due, now=datetime.utcnow):
+        self.on_due = on_due
+        self.now = now
+        self._heap = []
+        self._deadlines = {}
+        self._condition = threading.Condition()
+        self._thread = None
+        self._stopped = False
+
+    def _push(self, key, deadline, instants):
+        if not instants:
+            self._deadlines.pop(key, None)
+            return
+        self._deadlines[key] = (deadline, max(i for _, i in instants))
+        for kind, instant in instants:
+            heapq.heappush(self._heap, (instant, key, kind, deadline))
+
+    def schedule(self, key, deadline, instants):
+        """
+        Registers the instants (a list of (kind, datetime)) at which `key` needs
+        attention, replacing any earlier registration for the same key.
+        """
+        with self._condition:
+            earliest = self._heap[0][0] if self._heap else None
+            self._push(key, deadline, instants)
+            if instants and (earliest is None or min(i for _, i in instants) < earliest):
+                self._condition.notify()
+
+    def cancel(self, key):
+        with self._condition:
+            self._deadlines.pop(key, None)
+
+    def replace_all(self, entries):
+        """Rebuilds the heap from (key, deadline, instants) tuples."""
+        with self._condition:
+            self._heap = []
+            self._deadlines = {}
+            for key, deadline, instants in entries:
+                self._push(key, deadline, instants)
+            self._condition.notify()
+
+    def next_due(self):
+        with self._condition:
+            return self._heap[0][0] if self._heap else None
+
+    def __len__(self):
+        return len(self._deadlines)
+
+    def _pop_due(self):
+        """Pops every entry that is due and returns the (key, kind) pairs still valid."""
+        now = self.now()
+        due = []
+        while self._heap and self._heap[0][0] <= now:
+            instant, key, kind, deadline = heapq.heappop(self._heap)
+            current = self._deadlines.get(key)
+            if current is None or current[0] != deadline:
+                continue
+            due.append((key, kind))
+            if instant == current[1]:
+                del self._deadlines[key]
+        return due
+
+    def _wait_timeout(self):
+        if not self._heap:
+            return None
+        return max((self._heap[0][0] - self.now()).total_seconds(), 0)
+
+    def _run(self):
+        while True:
+            with self._condition:
+                due = self._pop_due()
+                while not due and not self._stopped:
+                    self._condition.wait(self._wait_timeout())
+                    due = self._pop_due()
+                if self._stopped:
+                    return
+            try:
+                self.on_due(due)
+            except Exception as e:
+                print(f"Deadline scheduler callback failed: {e}")
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name='deadline-scheduler', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        with self._condition:
+            self._stopped = True
+            self._condition.notify()
+        if self._thread:
+            self._thread.join()
@@ -0,0 +1,103 @@
+import json
+from datetime import datetime, timedelta
+from flask import current_app
+from app import db
+from app.models import File, Alert, Escalation
+from sqlalchemy import DateTime, Integer, and_, insert, literal, or_, select, update
+
+# Hours past the SLA deadline at which an overdue file moves up each level,
+# per priority. Level 1 goes to the Section Officer, level 2 to the Collector.
+DEFAULT_THRESHOLDS = {
+    'Critical': [4, 24],
+    'High': [12, 48],
+    'Medium': [24, 72],
+    'Low': [24, 72],
+}
+LEVEL_ROLES = {1: 'Section Officer', 2: 'Collector'}
+
+def get_thresholds(app=None):
+    """
+    Returns {priority: [timedelta per level]}. ESCALATION_THRESHOLDS may override
+    priorities with a JSON object of hour lists, e.g. '{"Critical": [2, 12]}'.
+    """
+    app = app or current_app
+    hours = dict(DEFAULT_THRESHOLDS)
+    if app.config.get('ESCALATION_THRESHOLDS'):
+        hours.update(json.loads(app.config['ESCALATION_THRESHOLDS']))
+    return {priority: [timedelta(hours=h) for h in levels] for priority, levels in hours.items()}
+
+def escalation_instants(priority, deadline, level, thresholds):
+    """Instants at which a file at `level` reaches each further level."""
+    return [deadline + offset for offset in thresholds.get(priority, [])[level or 0:]]
+
+def target_level(priority, deadline, now, thresholds):
+    return sum(1 for offset in thresholds.get(priority, []) if deadline + offset <= now)
+
+def due_escalations_query(now, thresholds):
+    """
+    Overdue files due for at least one more level. One disjunct per
+    (priority, current level), each a range seek on ix_file_escalation, so the
+    cost follows the number of files due rather than the overdue backlog.
+    """
+    # status and is_deleted are repeated in every disjunct so each one is a
+    # complete index seek; factored out, the planner scans all overdue rows
+    due = [
+        and_(File.status == 'Overdue', File.is_deleted == False, File.priority == priority,
+             File.escalation_level == level, File.sla_deadline <= now - offset)
+        for priority, offsets in thresholds.items()
+        for level, offset in enumerate(offsets)
+    ]
+    return db.session.query(File.id, File.priority, File.sla_deadline, File.escalation_level) \
+        .filter(or_(*due))
+
+def escalate_due(app=None, now=None, batch_size=500):
+    """
+    Raises every due overdue file to the level it has reached, writing one
+    Escalation row per level passed and one alert per file. Rows are written
+    with INSERT ... SELECT and level bumps with bulk UPDATEs, all guarded by the
+    level read, so running it twice (or concurrently) never escalates twice.
+    Returns the number of files escalated.
+    """
+    now = now or datetime.utcnow()
+    thresholds = get_thresholds(app)
+    escalated = 0
+
+    while True:
+        rows = due_escalations_query(now, thresholds).limit(batch_size).all()
+        if not rows:
+            break
+
+        # (current level, target level) -> file ids
+        groups = {}
+        for row in rows:
+            # max() keeps the loop moving if thresholds are configured out of order
+            target = max(target_level(row.priority, row.sla_deadline, now, thresholds), row.escalation_level + 1)
+            groups.setdefault((row.escalation_level, target), []).append(row.id)
+
+        for (level, target), ids in groups.items():
+            unchanged = and_(File.id.in_(ids), File.status == 'Overdue', File.escalation_level == level)
+            for new_level in range(level + 1, target + 1):
+                db.session.execute(
+                    insert(Escalation).from_select(
+                        ['file_id', 'level', 'triggered_at'],
+                        select(File.id, literal(new_level, Integer), literal(now, DateTime)).where(unchanged)
+                    )
+                )
+            role = LEVEL_ROLES.get(target, f'level {target}')
+            message = literal('File ') + File.filename + literal(f' escalated to {role} (level {target})')
+            db.session.execute(
+                insert(Alert).from_select(
+                    ['file_id', 'message', 'created_at', 'is_read'],
+                    select(File.id, message, literal(now, DateTime), literal(False)).where(unchanged)
+                )
+            )
+            escalated += db.session.execute(
+                update(File).where(unchanged).values(escalation_level=target)
+                .execution_options(synchronize_session=False)
+            ).rowcount
+
+        db.session.commit()
+        if len(rows) < batch_size:
+            break
+
+    return escalated
@@ -0,0 +1,55 @@
+import csv
+import io
+import json
+import zlib
+from app.services.listing_service import json_value
+
+# Fields written by the bulk export, in column order
+EXPORT_FIELDS = ['id', 'filename', 'section', 'priority', 'status', 'upload_date',
+                 'extracted_date', 'sla_deadline', 'completion_date']
+
+FORMATS = {
+    'csv': ('text/csv', 'csv'),
+    'ndjson': ('application/x-ndjson', 'ndjson'),
+}
+
+def iter_csv(rows, fields, flush_every=500):
+    """
+    Yields the CSV export a few hundred rows at a time. `rows` should be a
+    yield_per query, so only one chunk of rows is held in memory at once.
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(fields)
+    for i, row in enumerate(rows, 1):
+        writer.writerow(['' if value is None else json_value(value) for value in row])
+        if i % flush_every == 0:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+    yield buffer.getvalue()
+
+def iter_ndjson(rows, fields, flush_every=500):
+    """Yields one JSON object per line, flushed every `flush_every` rows."""
+    lines = []
+    for row in rows:
+        lines.append(json.dumps(dict(zip(fields, map(json_value, row)))))
+        if len(lines) == flush_every:
+            yield '\n'.join(lines) + '\n'
+            lines = []
+    if lines:
+        yield '\n'.join(lines) + '\n'
+
+def iter_export(rows, fmt, fields=EXPORT_FIELDS):
+    chunks = iter_csv(rows, fields) if fmt == 'csv' else iter_ndjson(rows, fields)
+    for chunk in chunks:
+        yield chunk.encode()
+
+def gzip_stream(chunks, level=6):
+    """Compresses a byte stream on the fly into a single gzip member."""
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 31) # wbits 31 = gzip header
+    for chunk in chunks:
+        compressed = compressor.compress(chunk)
+        if compressed:
+            yield compressed
+    yield compressor.flush()
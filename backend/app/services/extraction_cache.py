@@ -0,0 +1,96 @@
+import threading
+from datetime import datetime, timedelta
+from flask import current_app
+from sqlalchemy.exc import IntegrityError
+from app import db
+from app.models import ExtractionCache
+
+# Per-process counters, reported by cache_stats()
+_stats = {'hits': 0, 'misses': 0, 'stores': 0, 'evictions': 0}
+_stats_lock = threading.Lock()
+
+def _count(key, amount=1):
+    with _stats_lock:
+        _stats[key] += amount
+
+def cache_stats():
+    """
+    Returns a snapshot of this process's cache counters plus the hit rate.
+    """
+    with _stats_lock:
+        stats = dict(_stats)
+    lookups = stats['hits'] + stats['misses']
+    stats['hit_rate'] = round(stats['hits'] / lookups, 4) if lookups else 0.0
+    return stats
+
+def _max_age():
+    return timedelta(days=current_app.config.get('EXTRACTION_CACHE_MAX_AGE_DAYS', 90))
+
+def get_cached(content_hash, model_name, prompt_version):
+    """
+    Returns the cached {extracted_date, priority} for a document, or None.
+    Expired entries count as a miss and are dropped.
+    """
+    entry = ExtractionCache.query.filter_by(
+        content_hash=content_hash,
+        model_name=model_name,
+        prompt_version=prompt_version
+    ).first()
+
+    now = datetime.utcnow()
+    if entry and entry.created_at and now - entry.created_at > _max_age():
+        db.session.delete(entry)
+        db.session.commit()
+        _count('evictions')
+        entry = None
+
+    if not entry:
+        _count('misses')
+        return None
+
+    entry.hits = (entry.hits or 0) + 1
+    entry.last_used_at = now
+    db.session.commit()
+    _count('hits')
+    return {'extracted_date': entry.extracted_date, 'priority': entry.priority}
+
+def store(content_hash, model_name, prompt_version, result):
+    """
+    Saves an extraction result and evicts entries past the age or size limit.
+    """
+    try:
+        with db.session.begin_nested():
+            db.session.add(ExtractionCache(
+                content_hash=content_hash,
+                model_name=model_name,
+                prompt_version=prompt_version,
+                extracted_date=result.get('extracted_date'),
+                priority=result.get('priority') or 'Medium'
+            ))
+        _count('stores')
+    except IntegrityError:
+        # Another worker cached the same document first
+        pass
+
+    evict()
+    db.session.commit()
+
+def evict():
+    """
+    Deletes expired entries, then the least recently used ones beyond
+    EXTRACTION_CACHE_MAX_ENTRIES. Does not commit.
+    """
+    cutoff = datetime.utcnow() - _max_age()
+    removed = ExtractionCache.query.filter(ExtractionCache.created_at < cutoff).delete(synchronize_session=False)
+
+    max_entries = current_app.config.get('EXTRACTION_CACHE_MAX_ENTRIES', 10000)
+    excess = ExtractionCache.query.count() - max_entries
+    if excess > 0:
+        stale_ids = [row.id for row in ExtractionCache.query
+                     .with_entities(ExtractionCache.id)
+                     .order_by(ExtractionCache.last_used_at.asc())
+                     .limit(excess)]
+        removed += ExtractionCache.query.filter(ExtractionCache.id.in_(stale_ids)).delete(synchronize_session=False)
+
+    if removed:
+        _count('evictions', removed)
@@ -0,0 +1,183 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from app import db
+from app.models import File
+from app.services import counter_service
+from app.services.ai_service import extract_metadata
+from app.services.sla_service import apply_sla
+from app.services.scheduler_service import notify_deadline
+from sqlalchemy import update
+
+# Process-wide worker pool for metadata extraction, created on first use
+_executor = None
+_executor_lock = threading.Lock()
+
+def _get_executor(app):
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=app.config.get('EXTRACTION_WORKERS', 4),
+                thread_name_prefix='extraction'
+            )
+        return _executor
+
+def submit_extraction(app, file_id):
+    """
+    Queues metadata extraction for an already persisted File row.
+    The row must be committed before calling this.
+    """
+    return _get_executor(app).submit(run_extraction, app, file_id)
+
+def extract_batch(app, documents):
+    """
+    Runs extract_metadata for several documents concurrently on a short-lived,
+    bounded pool. `documents` is a list of (file_path, filename, content_hash).
+    Returns a list of (metadata, error) in input order; error is None on success.
+    """
+    def _extract(document):
+        with app.app_context():
+            try:
+                return extract_metadata(*document), None
+            except Exception as e:
+                print(f"Batch extraction failed for {document[1]}: {e}")
+                return {}, str(e)
+
+    if not documents:
+        return []
+
+    workers = min(app.config.get('BATCH_EXTRACTION_WORKERS', 8), len(documents))
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='batch-extraction') as pool:
+        return list(pool.map(_extract, documents))
+
+def apply_metadata(file, metadata):
+    """
+    Copies extracted priority and date onto a File row.
+    Returns the priority that was applied.
+    """
+    priority = metadata.get('priority') or 'Medium'
+    extracted_date = metadata.get('extracted_date')
+
+    file.priority = priority
+    file.extracted_date = datetime.strptime(extracted_date, '%Y-%m-%d').date() if extracted_date else None
+    return priority
+
+def _move_to_pending(file, metadata, extraction_status):
+    """
+    Moves a file that is still 'Extracting' to 'Pending' and, in the same
+    transaction, applies the metadata and the SLA that follows from it. The
+    move is a guarded UPDATE, so when extraction runs (or a run and the
+    recovery job) race, exactly one of them sets the priority and deadline
+    and counts the file. Returns True if this call moved it. Does not commit.
+    """
+    moved = db.session.execute(
+        update(File)
+        .where(File.id == file.id, File.status == 'Extracting')
+        .values(status='Pending', extraction_status=extraction_status, extraction_updated_at=datetime.utcnow())
+        .execution_options(synchronize_session=False)
+    ).rowcount
+    if not moved:
+        return False
+
+    db.session.refresh(file)
+    priority = apply_metadata(file, metadata)
+    # SLA runs from the time of upload, not from when extraction finished
+    apply_sla(file, priority, file.upload_date)
+    if not file.is_deleted:
+        counter_service.record_transition(file.section_id, 'Extracting', 'Pending')
+    return True
+
+def run_extraction(app, file_id):
+    """
+    Runs extraction for a single file and fills in priority, extracted date
+    and SLA deadline. The file moves from 'Extracting' to 'Pending' whether
+    or not extraction succeeds, so it is never left out of SLA monitoring.
+    """
+    with app.app_context():
+        # Claim the queued row. If it is already running elsewhere, was given
+        # the default SLA by recovery, or was completed, there is nothing to do
+        claimed = db.session.execute(
+            update(File)
+            .where(File.id == file_id, File.status == 'Extracting', File.extraction_status == 'Queued')
+            .values(extraction_status='Running', extraction_updated_at=datetime.utcnow())
+            .execution_options(synchronize_session=False)
+        ).rowcount
+        db.session.commit()
+        if not claimed:
+            return
+
+        file = db.session.get(File, file_id)
+        try:
+            metadata = extract_metadata(file.file_path, file.filename, file.content_hash)
+            extraction_status = 'Done'
+        except Exception as e:
+            print(f"Extraction job failed for file {file_id}: {e}")
+            metadata = {}
+            extraction_status = 'Failed'
+
+        if _move_to_pending(file, metadata, extraction_status):
+            db.session.commit()
+            if not file.is_deleted:
+                notify_deadline(file)
+            return
+
+        # Completed while extraction was running: record the outcome only
+        db.session.execute(
+            update(File)
+            .where(File.id == file_id, File.extraction_status == 'Running')
+            .values(extraction_status=extraction_status, extraction_updated_at=datetime.utcnow())
+            .execution_options(synchronize_session=False)
+        )
+        db.session.commit()
+
+def recover_stale_extractions(app):
+    """
+    Scheduler job for uploads whose extraction was lost with the process that
+    queued it (restart, recycle, crash). Files stuck in Queued/Running for
+    EXTRACTION_STALE_MINUTES are queued again; once a file has been stuck for
+    EXTRACTION_MAX_ATTEMPTS times that long it gets the default priority and
+    its SLA instead, so it still enters SLA monitoring.
+    Returns (requeued, failed_over).
+    """
+    with app.app_context():
+        stale = timedelta(minutes=app.config.get('EXTRACTION_STALE_MINUTES', 15))
+        now = datetime.utcnow()
+        give_up = now - stale * app.config.get('EXTRACTION_MAX_ATTEMPTS', 3)
+
+        rows = db.session.query(File.id, File.upload_date).filter(
+            File.status == 'Extracting',
+            File.extraction_status.in_(['Queued', 'Running']),
+            File.extraction_updated_at < now - stale
+        ).all()
+
+        requeued, failed_over = [], []
+        for row in rows:
+            if row.upload_date < give_up:
+                file = db.session.get(File, row.id)
+                if _move_to_pending(file, {}, 'Failed'):
+                    failed_over.append(file)
+                continue
+
+            # Claim the row so a concurrent recovery run does not queue it twice.
+            # If the original job was only waiting in a busy queue, whichever of
+            # the two runs first claims it and the other returns straight away
+            claimed = db.session.execute(
+                update(File)
+                .where(File.id == row.id, File.status == 'Extracting', File.extraction_updated_at < now - stale)
+                .values(extraction_status='Queued', extraction_updated_at=now)
+                .execution_options(synchronize_session=False)
+            ).rowcount
+            if claimed:
+                requeued.append(row.id)
+
+        db.session.commit()
+        for file in failed_over:
+            if not file.is_deleted:
+                notify_deadline(file)
+
+    for file_id in requeued:
+        submit_extraction(app, file_id)
+    if requeued or failed_over:
+        print(f"Extraction recovery: {len(requeued)} file(s) re-queued, {len(failed_over)} given the default SLA")
+    return len(requeued), len(failed_over)
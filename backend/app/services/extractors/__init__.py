@@ -0,0 +1,30 @@
+from flask import current_app
+from app.services.extractors.base import ExtractorBackend
+from app.services.extractors.local import LocalExtractor
+from app.services.extractors.gemini import GeminiExtractor
+from app.services.extractors.fake import FakeExtractor
+
+BACKENDS = {}
+
+def register_backend(backend_class):
+    """
+    Makes a backend selectable by name in EXTRACTOR_BACKENDS. Usable as a class decorator.
+    """
+    BACKENDS[backend_class.name] = backend_class
+    return backend_class
+
+for _backend in (LocalExtractor, GeminiExtractor, FakeExtractor):
+    register_backend(_backend)
+
+def get_chain(app=None):
+    """
+    Builds the backend chain from the comma-separated EXTRACTOR_BACKENDS setting,
+    e.g. "local,gemini" tries local extraction first and only calls the model
+    when no date was found.
+    """
+    app = app or current_app
+    names = [name.strip() for name in app.config.get('EXTRACTOR_BACKENDS', 'local,gemini').split(',') if name.strip()]
+    unknown = [name for name in names if name not in BACKENDS]
+    if unknown:
+        raise ValueError(f"Unknown extractor backend(s): {', '.join(unknown)}")
+    return [BACKENDS[name]() for name in names]
@@ -0,0 +1,13 @@
+class ExtractorBackend:
+    """
+    A source of document metadata. Subclasses set `name` and implement extract().
+    """
+    name = None
+
+    def extract(self, file_path, filename, content_hash):
+        """
+        Returns a dict with 'extracted_date' (YYYY-MM-DD) and 'priority', either of
+        which may be None when the backend could not determine it, or None if the
+        backend cannot handle this document at all.
+        """
+        raise NotImplementedError
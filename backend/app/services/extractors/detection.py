@@ -0,0 +1,73 @@
+import re
+from datetime import datetime
+
+# Date formats with flexible whitespace, tried in this order
+# Matches YYYY -MM -DD, DD -MM -YYYY, DD / MM / YYYY
+DATE_PATTERNS = [
+    re.compile(r'\b(\d{4})\s*-\s*(\d{1,2})\s*-\s*(\d{1,2})\b'), # YYYY-MM-DD with spaces
+    re.compile(r'\b(\d{1,2})\s*-\s*(\d{1,2})\s*-\s*(\d{4})\b'), # DD-MM-YYYY with spaces
+    re.compile(r'\b(\d{1,2})\s*/\s*(\d{1,2})\s*/\s*(\d{4})\b')  # DD/MM/YYYY with spaces
+]
+
+# Keywords that mark a document as more urgent than the default 'Medium'.
+# Checked from most to least urgent; the first level with a hit wins.
+PRIORITY_KEYWORDS = [
+    ('Critical', re.compile(r'\b(life\s+threatening|emergency|immediate\s+action|critical)\b', re.IGNORECASE)),
+    ('High', re.compile(r'\b(urgent|urgently|immediately|at\s+the\s+earliest|top\s+priority)\b', re.IGNORECASE)),
+]
+
+PRIORITY_LEVELS = ['Low', 'Medium', 'High', 'Critical']
+
+def more_urgent(a, b):
+    """
+    Returns the more urgent of two priority levels; either may be None.
+    """
+    if not a or not b:
+        return a or b
+    return a if PRIORITY_LEVELS.index(a) >= PRIORITY_LEVELS.index(b) else b
+
+def _to_iso(groups):
+    if len(groups[0]) == 4: # YYYY-MM-DD
+        year, month, day = groups
+    else: # DD-MM-YYYY or DD/MM/YYYY -> assume DD-MM-YYYY
+        day, month, year = groups
+    try:
+        return datetime(int(year), int(month), int(day)).strftime('%Y-%m-%d')
+    except ValueError:
+        # Looks like a date but isn't one (e.g. reference numbers)
+        return None
+
+def find_date(text):
+    """
+    Returns the first valid date in `text` as YYYY-MM-DD, or None.
+    """
+    if not text:
+        return None
+    for pattern in DATE_PATTERNS:
+        for match in pattern.finditer(text):
+            found = _to_iso(match.groups())
+            if found:
+                return found
+    return None
+
+def detect_priority(text):
+    """
+    Returns a priority level if the text contains an urgency keyword, otherwise None.
+    """
+    if not text:
+        return None
+    for level, pattern in PRIORITY_KEYWORDS:
+        if pattern.search(text):
+            return level
+    return None
+
+def normalize_date(date_str):
+    """
+    Normalizes a date string in one of the formats models tend to return to YYYY-MM-DD.
+    """
+    for fmt in ('%Y-%m-%d', '%d-%m-%Y', '%d/%m/%Y', '%m-%d-%Y', '%m/%d/%Y'):
+        try:
+            return datetime.strptime(date_str, fmt).strftime('%Y-%m-%d')
+        except ValueError:
+            continue
+    return None
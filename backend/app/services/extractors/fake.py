@@ -0,0 +1,18 @@
+from flask import current_app
+from app.services.extractors.base import ExtractorBackend
+
+class FakeExtractor(ExtractorBackend):
+    """
+    Deterministic backend for tests. Returns FAKE_EXTRACTOR_RESULT from config
+    and records every file it was asked about.
+    """
+    name = 'fake'
+    calls = []
+
+    def extract(self, file_path, filename, content_hash):
+        FakeExtractor.calls.append(filename or file_path)
+        result = current_app.config.get('FAKE_EXTRACTOR_RESULT') or {}
+        return {
+            'extracted_date': result.get('extracted_date'),
+            'priority': result.get('priority', 'Medium')
+        }
@@ -0,0 +1,97 @@
+import json
+import mimetypes
+import re
+from flask import current_app
+from app.services import extraction_cache
+from app.services.extractors.base import ExtractorBackend
+from app.services.extractors.detection import normalize_date
+from app.services.extractors.preprocess import prepare_for_model
+from app.services.gemini_client import get_client, CircuitOpenError
+
+# Bump whenever EXTRACTION_PROMPT or the response parsing changes, so cached
+# results produced by the old prompt are no longer used
+PROMPT_VERSION = '1'
+
+EXTRACTION_PROMPT = """
+        Extract the following information from the document:
+        1. Complaint/Document Date. Return in YYYY-MM-DD format only. If the date is in DD-MM-YYYY or other formats, convert it to YYYY-MM-DD.
+        2. Priority (Low, Medium, High, Critical) based on the content urgency.
+        
+        Output valid JSON only: {"extracted_date": "YYYY-MM-DD", "priority": "Level"}
+        """
+
+def parse_response(text):
+    """
+    Pulls {extracted_date, priority} out of a model response, tolerating
+    markdown code fences and surrounding prose. priority is None unless the
+    response held a JSON object with a priority in it.
+    """
+    result = {'extracted_date': None, 'priority': None}
+
+    # Clean up markdown code blocks if present
+    text = text.replace('```json', '').replace('```', '')
+
+    # Find JSON substring
+    match = re.search(r'\{.*\}', text, re.DOTALL)
+    if not match:
+        return result
+
+    try:
+        data = json.loads(match.group(0))
+    except json.JSONDecodeError:
+        print(f"Failed to decode JSON: {match.group(0)}")
+        return result
+
+    if not isinstance(data, dict):
+        return result
+
+    result['priority'] = data.get('priority')
+    date_str = data.get('extracted_date')
+    if date_str:
+        result['extracted_date'] = normalize_date(date_str)
+    return result
+
+class GeminiExtractor(ExtractorBackend):
+    """
+    Sends the document to Gemini through the shared client. Responses are
+    cached by (content_hash, model, PROMPT_VERSION).
+    """
+    name = 'gemini'
+
+    def extract(self, file_path, filename, content_hash):
+        model_name = current_app.config.get('GEMINI_MODEL', 'gemini-2.0-flash')
+
+        cached = extraction_cache.get_cached(content_hash, model_name, PROMPT_VERSION)
+        if cached:
+            print(f"Extraction cache hit for {content_hash}")
+            return cached
+
+        client = get_client()
+        if not client:
+            print("Gemini API Key not found.")
+            return None
+
+        try:
+            mime_type = mimetypes.guess_type(filename or file_path)[0]
+            with prepare_for_model(file_path, filename, mime_type) as prepared:
+                print(f"Uploading file to Gemini: {file_path}")
+                # Rate limiting, deadlines, retries and the circuit breaker live in the shared client
+                text = client.generate(prepared.path, EXTRACTION_PROMPT, mime_type=prepared.mime_type)
+            print(f"Gemini response: {text}")
+        except CircuitOpenError:
+            print("Gemini circuit breaker open, skipping API call.")
+            return None
+        except Exception as e:
+            print(f"Error in AI extraction or API call: {e}")
+            return None
+
+        result = parse_response(text)
+        if not result['priority']:
+            # e.g. "I cannot read this document": handled like an API failure,
+            # so it is not cached and the next upload asks the model again
+            print("Gemini response held no usable JSON, not caching it")
+            return None
+
+        # Only parsed model responses are cached; failures are retried next time
+        extraction_cache.store(content_hash, model_name, PROMPT_VERSION, result)
+        return result
@@ -0,0 +1,113 @@
+import os
+import zipfile
+import xml.etree.ElementTree as ET
+from itertools import islice
+from flask import current_app
+from app.services.extractors.base import ExtractorBackend
+from app.services.extractors.detection import find_date, detect_priority, more_urgent
+
+# Plain text files are scanned in blocks of whole lines of roughly this size
+TEXT_BLOCK_SIZE = 64 * 1024
+
+WORD_NS = '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}'
+
+def iter_text_blocks(file_path):
+    """
+    Yields a text file in blocks of whole lines, so a date never straddles two blocks
+    unless it spans a line break.
+    """
+    with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
+        block = []
+        size = 0
+        for line in f:
+            block.append(line)
+            size += len(line)
+            if size >= TEXT_BLOCK_SIZE:
+                yield ''.join(block)
+                block, size = [], 0
+        if block:
+            yield ''.join(block)
+
+def iter_pdf_pages(file_path, max_pages=None):
+    """
+    Yields the text of each PDF page in order, extracting one page at a time.
+    Stops after `max_pages` pages when set.
+    """
+    import PyPDF2
+    with open(file_path, 'rb') as f:
+        reader = PyPDF2.PdfReader(f)
+        for page in islice(reader.pages, max_pages):
+            yield page.extract_text() or ""
+
+def iter_docx_paragraphs(file_path):
+    """
+    Yields the text of each paragraph in a DOCX body. word/document.xml is
+    decompressed and parsed incrementally, and finished paragraphs are cleared,
+    so memory stays flat however long the document is.
+    """
+    with zipfile.ZipFile(file_path) as archive:
+        with archive.open('word/document.xml') as xml_stream:
+            parser = ET.XMLPullParser(events=('end',))
+            parts = []
+            for chunk in iter(lambda: xml_stream.read(TEXT_BLOCK_SIZE), b''):
+                parser.feed(chunk)
+                for _, elem in parser.read_events():
+                    if elem.tag == WORD_NS + 't':
+                        parts.append(elem.text or '')
+                    elif elem.tag == WORD_NS + 'tab':
+                        parts.append('\t')
+                    elif elem.tag == WORD_NS + 'br':
+                        parts.append('\n')
+                    elif elem.tag == WORD_NS + 'p':
+                        text = ''.join(parts)
+                        parts = []
+                        elem.clear()
+                        if text:
+                            yield text
+            parser.close()
+            if parts:
+                yield ''.join(parts)
+
+class LocalExtractor(ExtractorBackend):
+    """
+    Reads text out of txt, pdf and docx documents on this machine and runs
+    the shared date/priority detection on it. No network calls.
+    """
+    name = 'local'
+
+    def iter_text(self, file_path, ext):
+        """
+        Returns an iterator of text segments for supported types, otherwise None.
+        """
+        if ext == '.txt':
+            return iter_text_blocks(file_path)
+        if ext == '.pdf':
+            return iter_pdf_pages(file_path, current_app.config.get('PDF_SCAN_MAX_PAGES'))
+        if ext == '.docx':
+            return iter_docx_paragraphs(file_path)
+        return None
+
+    def extract(self, file_path, filename, content_hash):
+        ext = os.path.splitext(filename or file_path)[1].lower()
+        segments = self.iter_text(file_path, ext)
+        if segments is None:
+            return None
+
+        # Scan segment by segment and stop at the first date, so the cost depends
+        # on where the date appears rather than on document length
+        found_date = None
+        priority = None
+        scanned = 0
+        for text in segments:
+            scanned += 1
+            priority = more_urgent(priority, detect_priority(text))
+            found_date = find_date(text)
+            if found_date:
+                break
+
+        if found_date:
+            print(f"Local extraction found: {found_date} (segment {scanned})")
+        else:
+            print(f"Local extraction failed to find a date in {scanned} segment(s).")
+
+        return {'extracted_date': found_date, 'priority': priority}
@@ -0,0 +1,96 @@
+import os
+import tempfile
+import threading
+from flask import current_app
+
+IMAGE_EXTENSIONS = {'.png', '.jpg', '.jpeg'}
+
+# Per-process totals, reported by preprocess_stats() under /api/dashboard/cache/stats
+_stats = {'files': 0, 'bytes_before': 0, 'bytes_after': 0}
+_stats_lock = threading.Lock()
+
+def preprocess_stats():
+    """Returns this process's totals of bytes read and bytes sent to the model."""
+    with _stats_lock:
+        stats = dict(_stats)
+    stats['saved_ratio'] = round(1 - stats['bytes_after'] / stats['bytes_before'], 4) if stats['bytes_before'] else 0.0
+    return stats
+
+class PreparedFile:
+    """
+    The payload actually sent to the model. Use as a context manager so any
+    temporary file is removed afterwards.
+    """
+    def __init__(self, path, mime_type, bytes_before, bytes_after, temporary=False):
+        self.path = path
+        self.mime_type = mime_type
+        self.bytes_before = bytes_before
+        self.bytes_after = bytes_after
+        self.temporary = temporary
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        if self.temporary and os.path.exists(self.path):
+            os.remove(self.path)
+
+def _shrink_image(file_path, out_path, max_dim, quality):
+    from PIL import Image, ImageOps
+    with Image.open(file_path) as image:
+        image = ImageOps.exif_transpose(image)
+        image.thumbnail((max_dim, max_dim))
+        if image.mode not in ('RGB', 'L'):
+            image = image.convert('RGB')
+        image.save(out_path, 'JPEG', quality=quality, optimize=True)
+
+def _first_pdf_pages(file_path, out_path, max_pages):
+    import PyPDF2
+    reader = PyPDF2.PdfReader(file_path)
+    if len(reader.pages) <= max_pages:
+        return False
+    writer = PyPDF2.PdfWriter()
+    for page in reader.pages[:max_pages]:
+        writer.add_page(page)
+    with open(out_path, 'wb') as out:
+        writer.write(out)
+    return True
+
+def prepare_for_model(file_path, filename, mime_type):
+    """
+    Shrinks the payload before it is uploaded to the model: images are
+    downscaled to MODEL_IMAGE_MAX_DIM and re-encoded as JPEG, PDFs are cut to
+    their first MODEL_PDF_MAX_PAGES pages. Falls back to the original file if
+    processing fails or does not make it smaller.
+    """
+    ext = os.path.splitext(filename or file_path)[1].lower()
+    bytes_before = os.path.getsize(file_path)
+    prepared = PreparedFile(file_path, mime_type, bytes_before, bytes_before)
+
+    if ext in IMAGE_EXTENSIONS or ext == '.pdf':
+        fd, out_path = tempfile.mkstemp(suffix='.jpg' if ext in IMAGE_EXTENSIONS else '.pdf')
+        os.close(fd)
+        try:
+            if ext in IMAGE_EXTENSIONS:
+                _shrink_image(file_path, out_path,
+                              current_app.config.get('MODEL_IMAGE_MAX_DIM', 1600),
+                              current_app.config.get('MODEL_IMAGE_QUALITY', 80))
+                written, out_mime = True, 'image/jpeg'
+            else:
+                written = _first_pdf_pages(file_path, out_path, current_app.config.get('MODEL_PDF_MAX_PAGES', 5))
+                out_mime = mime_type
+
+            if written and os.path.getsize(out_path) < bytes_before:
+                prepared = PreparedFile(out_path, out_mime, bytes_before, os.path.getsize(out_path), temporary=True)
+        except Exception as e:
+            print(f"Pre-processing failed for {filename or file_path}, sending original: {e}")
+
+        if not prepared.temporary:
+            os.remove(out_path)
+
+    with _stats_lock:
+        _stats['files'] += 1
+        _stats['bytes_before'] += prepared.bytes_before
+        _stats['bytes_after'] += prepared.bytes_after
+    print(f"Model payload for {filename or file_path}: {prepared.bytes_before} -> {prepared.bytes_after} bytes")
+    return prepared
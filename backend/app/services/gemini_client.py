@@ -0,0 +1,204 @@
+import threading
+import time
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+from flask import current_app
+
+class CircuitOpenError(Exception):
+    """Raised when the circuit breaker is refusing calls to the model."""
+
+class TokenBucket:
+    """
+    Classic token bucket: `rate` tokens per second, holding at most `capacity`.
+    """
+    def __init__(self, rate, capacity, clock=time.monotonic, sleep=time.sleep):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._clock = clock
+        self._sleep = sleep
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def _refill(self):
+        now = self._clock()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def acquire(self):
+        """
+        Blocks until a token is available.
+        """
+        while True:
+            with self._lock:
+                self._refill()
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            self._sleep(wait)
+
+class CircuitBreaker:
+    """
+    Opens after `failure_threshold` consecutive failures. After `reset_timeout`
+    seconds a single probe call is let through; its outcome closes or re-opens
+    the circuit.
+    """
+    def __init__(self, failure_threshold=5, reset_timeout=60, clock=time.monotonic):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = 'closed' # closed, open, half_open
+        self._failures = 0
+        self._opened_at = None
+        self._clock = clock
+        self._lock = threading.Lock()
+
+    def allow(self):
+        with self._lock:
+            if self.state == 'open':
+                if self._clock() - self._opened_at < self.reset_timeout:
+                    return False
+                self.state = 'half_open'
+                return True
+            if self.state == 'half_open':
+                # The probe call is still in flight
+                return False
+            return True
+
+    def record_success(self):
+        with self._lock:
+            self._failures = 0
+            self.state = 'closed'
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            if self.state == 'half_open' or self._failures >= self.failure_threshold:
+                self.state = 'open'
+                self._opened_at = self._clock()
+
+class GeminiClient:
+    """
+    Process-wide wrapper around a Gemini model: caps concurrent calls,
+    rate-limits them, enforces a deadline per attempt, retries with exponential
+    backoff and trips a circuit breaker when the API keeps failing.
+
+    `model` only needs generate_content() and `upload` has the signature of
+    genai.upload_file, so a local fake can be passed in for tests.
+    """
+    def __init__(self, model, upload, max_concurrency=4, rate_per_second=2.0, burst=5,
+                 timeout=30, max_retries=2, backoff_base=0.5, breaker=None, sleep=time.sleep):
+        self.model = model
+        self.upload = upload
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.breaker = breaker or CircuitBreaker()
+        self._bucket = TokenBucket(rate_per_second, burst, sleep=sleep)
+        self._sleep = sleep
+        # Concurrency cap; a timed-out call keeps its slot until it really returns
+        self._slots = threading.BoundedSemaphore(max_concurrency)
+
+    def _call(self, file_path, prompt, mime_type):
+        uploaded = self.upload(path=file_path, display_name="Uploaded File", mime_type=mime_type)
+        response = self.model.generate_content([uploaded, prompt], request_options={'timeout': self.timeout})
+        return response.text
+
+    def _start(self, file_path, prompt, mime_type):
+        """
+        Runs one call on its own thread once a slot is held, so the caller's
+        deadline starts when the call does rather than while queued for a slot.
+        """
+        future = Future()
+
+        def run():
+            try:
+                future.set_result(self._call(file_path, prompt, mime_type))
+            except Exception as e:
+                future.set_exception(e)
+            finally:
+                self._slots.release()
+
+        threading.Thread(target=run, name='gemini-call', daemon=True).start()
+        return future
+
+    def generate(self, file_path, prompt, mime_type=None):
+        """
+        Sends the file and prompt to the model and returns the response text.
+        Raises CircuitOpenError without calling the API while the circuit is open,
+        otherwise the last error once retries are exhausted.
+        """
+        last_error = None
+        for attempt in range(self.max_retries + 1):
+            if not self.breaker.allow():
+                raise CircuitOpenError('Gemini circuit breaker is open')
+
+            if attempt:
+                self._sleep(self.backoff_base * (2 ** (attempt - 1)))
+
+            # Waiting for a slot or a token is not part of the call's deadline
+            self._slots.acquire()
+            try:
+                self._bucket.acquire()
+            except BaseException:
+                self._slots.release()
+                raise
+            future = self._start(file_path, prompt, mime_type)
+            try:
+                text = future.result(timeout=self.timeout)
+            except FutureTimeoutError:
+                last_error = TimeoutError(f'Gemini call exceeded {self.timeout}s deadline')
+                self.breaker.record_failure()
+                print(f"Gemini attempt {attempt + 1} timed out")
+                continue
+            except Exception as e:
+                last_error = e
+                self.breaker.record_failure()
+                print(f"Gemini attempt {attempt + 1} failed: {e}")
+                continue
+
+            self.breaker.record_success()
+            return text
+
+        raise last_error
+
+_client = None
+_client_lock = threading.Lock()
+
+def get_client(app=None):
+    """
+    Returns the shared GeminiClient, building it from config on first use.
+    Returns None when no API key is configured.
+    """
+    global _client
+    app = app or current_app
+    with _client_lock:
+        if _client is None:
+            api_key = app.config.get('GEMINI_API_KEY')
+            if not api_key:
+                return None
+
+            import google.generativeai as genai
+            genai.configure(api_key=api_key)
+            _client = GeminiClient(
+                model=genai.GenerativeModel(app.config.get('GEMINI_MODEL', 'gemini-2.0-flash')),
+                upload=genai.upload_file,
+                max_concurrency=app.config.get('GEMINI_MAX_CONCURRENCY', 4),
+                rate_per_second=app.config.get('GEMINI_RATE_PER_SECOND', 2.0),
+                burst=app.config.get('GEMINI_BURST', 5),
+                timeout=app.config.get('GEMINI_TIMEOUT', 30),
+                max_retries=app.config.get('GEMINI_MAX_RETRIES', 2),
+                backoff_base=app.config.get('GEMINI_BACKOFF_BASE', 0.5),
+                breaker=CircuitBreaker(
+                    failure_threshold=app.config.get('GEMINI_BREAKER_THRESHOLD', 5),
+                    reset_timeout=app.config.get('GEMINI_BREAKER_RESET', 60)
+                )
+            )
+        return _client
+
+def set_client(client):
+    """
+    Replaces the shared client, e.g. with one wrapping a fake model in tests.
+    """
+    global _client
+    with _client_lock:
+        _client = client
@@ -0,0 +1,103 @@
+import os
+import socket
+import threading
+import uuid
+from datetime import datetime, timedelta
+from app import db
+from app.models import SchedulerLease
+from sqlalchemy import delete, or_, update
+from sqlalchemy.exc import IntegrityError
+
+def make_holder_id():
+    """Identifies this process in the lease table, e.g. 'web-1:4242:9f1c2a7b'."""
+    return f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+def try_acquire(name, holder, ttl):
+    """
+    Takes or renews the lease in a single conditional UPDATE, which succeeds
+    only if this holder already owns it or the current lease has expired.
+    Inserts the row the first time. Returns True if `holder` owns the lease.
+    """
+    now = datetime.utcnow()
+    expires_at = now + timedelta(seconds=ttl)
+    renewed = db.session.execute(
+        update(SchedulerLease)
+        .where(SchedulerLease.name == name,
+               or_(SchedulerLease.holder == holder, SchedulerLease.expires_at < now))
+        .values(holder=holder, expires_at=expires_at)
+        .execution_options(synchronize_session=False)
+    ).rowcount
+    if renewed:
+        db.session.commit()
+        return True
+
+    try:
+        with db.session.begin_nested():
+            db.session.add(SchedulerLease(name=name, holder=holder, acquired_at=now, expires_at=expires_at))
+        db.session.commit()
+        return True
+    except IntegrityError:
+        # Row exists and is held by someone else
+        db.session.rollback()
+        return False
+
+def release(name, holder):
+    db.session.execute(
+        delete(SchedulerLease).where(SchedulerLease.name == name, SchedulerLease.holder == holder)
+    )
+    db.session.commit()
+
+class LeaderElector:
+    """
+    Heartbeat thread that competes for a lease. `on_elected` runs when this
+    process takes the lease and `on_demoted` when it loses it (a failed
+    renewal, e.g. after a long pause, or a database error).
+    """
+
+    def __init__(self, app, name, on_elected, on_demoted, ttl=60, heartbeat=20):
+        self.app = app
+        self.name = name
+        self.on_elected = on_elected
+        self.on_demoted = on_demoted
+        self.ttl = ttl
+        self.heartbeat = heartbeat
+        self.holder = make_holder_id()
+        self.is_leader = False
+        self._stop = threading.Event()
+        self._thread = None
+
+    def beat(self):
+        with self.app.app_context():
+            try:
+                leader = try_acquire(self.name, self.holder, self.ttl)
+            except Exception as e:
+                print(f"Lease heartbeat for '{self.name}' failed: {e}")
+                leader = False
+
+        if leader and not self.is_leader:
+            print(f"{self.holder} is now the '{self.name}' leader")
+            self.is_leader = True
+            self.on_elected()
+        elif not leader and self.is_leader:
+            print(f"{self.holder} lost the '{self.name}' lease")
+            self.is_leader = False
+            self.on_demoted()
+
+    def _run(self):
+        while not self._stop.is_set():
+            self.beat()
+            self._stop.wait(self.heartbeat)
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name=f'lease-{self.name}', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread:
+            self._thread.join()
+        if self.is_leader:
+            self.is_leader = False
+            self.on_demoted()
+            with self.app.app_context():
+                release(self.name, self.holder)
@@ -0,0 +1,63 @@
+from datetime import date, datetime, timedelta
+from app import db
+from app.models import File, Section
+
+# Columns a file listing can project, by output field name
+FIELDS = {
+    'id': File.id,
+    'filename': File.filename,
+    'section': Section.name,
+    'section_id': File.section_id,
+    'priority': File.priority,
+    'status': File.status,
+    'upload_date': File.upload_date,
+    'extracted_date': File.extracted_date,
+    'sla_deadline': File.sla_deadline,
+    'completion_date': File.completion_date,
+    'deletion_remarks': File.deletion_remarks
+}
+
+def file_listing_query(fields):
+    """
+    Returns a query selecting only the given fields from `file` joined to
+    `section`, so a listing is one SQL statement with no ORM objects built.
+    Filters can be chained on File/Section columns as usual.
+    """
+    columns = [FIELDS[field].label(field) for field in fields]
+    return db.session.query(*columns).select_from(File).join(Section, File.section_id == Section.id)
+
+def apply_listing_filters(query, args):
+    """
+    Applies the optional status, priority, section and upload date range filters
+    from the query string. Returns (query, error).
+    """
+    if args.get('status'):
+        query = query.filter(File.status == args['status'])
+    if args.get('priority'):
+        query = query.filter(File.priority == args['priority'])
+    if args.get('section_id'):
+        query = query.filter(File.section_id == args.get('section_id', type=int))
+    if args.get('section'):
+        query = query.filter(Section.name == args['section'])
+
+    try:
+        if args.get('date_from'):
+            query = query.filter(File.upload_date >= datetime.strptime(args['date_from'], '%Y-%m-%d'))
+        if args.get('date_to'):
+            # Inclusive: everything uploaded on date_to
+            query = query.filter(File.upload_date < datetime.strptime(args['date_to'], '%Y-%m-%d') + timedelta(days=1))
+    except ValueError:
+        return query, 'Dates must be in YYYY-MM-DD format'
+
+    return query, None
+
+def json_value(value):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return value
+
+def serialize_rows(rows, fields):
+    """
+    Turns projected rows into JSON-ready dicts; dates become ISO strings.
+    """
+    return [dict(zip(fields, map(json_value, row))) for row in rows]
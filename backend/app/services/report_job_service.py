@@ -0,0 +1,305 @@
+import multiprocessing
+import os
+import shutil
+import threading
+import uuid
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from datetime import datetime, timedelta
+from PyPDF2 import PdfWriter
+from reportlab.lib.pagesizes import letter, landscape
+from reportlab.pdfgen import canvas
+from reportlab.lib import colors
+from sqlalchemy import create_engine, delete, select, update
+from app import db
+from app.models import File, Section, ReportJob
+
+# Detailed reports: one process-pool task per section renders that section's
+# pending and overdue files, then the coordinator thread merges the parts.
+# Rendering runs in separate processes because ReportLab is CPU-bound and
+# would otherwise hold the GIL of the web worker for the whole job.
+
+REPORT_STATUSES = ('Pending', 'Overdue')
+COLUMNS = [('File', 40), ('Priority', 270), ('Status', 340), ('Uploaded', 410), ('Deadline', 510), ('SLA used', 630)]
+
+_process_pool = None
+_coordinator = None
+_pool_lock = threading.Lock()
+# Jobs submitted to this process's coordinator and not started yet; running
+# jobs keep their heartbeat fresh so fail_stale_jobs leaves them alone
+_waiting = set()
+
+def _get_process_pool(app):
+    global _process_pool
+    with _pool_lock:
+        if _process_pool is None:
+            # spawn, not fork: the web process has scheduler and extraction threads
+            _process_pool = ProcessPoolExecutor(
+                max_workers=app.config.get('REPORT_WORKERS', 2),
+                mp_context=multiprocessing.get_context('spawn')
+            )
+        return _process_pool
+
+def _reset_process_pool():
+    global _process_pool
+    with _pool_lock:
+        _process_pool = None
+
+def _get_coordinator(app):
+    global _coordinator
+    with _pool_lock:
+        if _coordinator is None:
+            _coordinator = ThreadPoolExecutor(
+                max_workers=app.config.get('REPORT_WORKERS', 2),
+                thread_name_prefix='report-job'
+            )
+        return _coordinator
+
+# --- Runs inside the worker processes -------------------------------------
+
+_engines = {}
+
+def _engine(database_uri):
+    engine = _engines.get(database_uri)
+    if engine is None:
+        engine = _engines[database_uri] = create_engine(database_uri)
+    return engine
+
+def _sla_used(upload_date, deadline, now):
+    if not upload_date or not deadline or deadline <= upload_date:
+        return '-'
+    return f"{(now - upload_date) / (deadline - upload_date) * 100:.0f}%"
+
+def _draw_header(p, height, section_name, now):
+    p.setFillColor(colors.darkblue)
+    p.setFont("Helvetica-Bold", 16)
+    p.drawString(40, height - 40, f"Detailed File Report - Section {section_name}")
+    p.setFont("Helvetica", 10)
+    p.setFillColor(colors.black)
+    p.drawString(40, height - 56, f"Pending and overdue files as of {now.strftime('%Y-%m-%d %H:%M')} UTC")
+
+    y = height - 85
+    p.setFont("Helvetica-Bold", 10)
+    for title, x in COLUMNS:
+        p.drawString(x, y, title)
+    p.setStrokeColor(colors.lightgrey)
+    p.line(40, y - 5, 750, y - 5)
+    return y - 20
+
+def render_section_report(database_uri, section_id, section_name, out_path, now, chunk_size=500):
+    """
+    Renders the detailed report for one section into `out_path`. Rows are
+    streamed from the database `chunk_size` at a time rather than loaded at
+    once. Runs in a worker process, so it uses a plain engine instead of the
+    Flask app. Returns the number of files listed.
+    """
+    query = select(File.filename, File.priority, File.status, File.upload_date, File.sla_deadline) \
+        .where(File.section_id == section_id, File.is_deleted == False, File.status.in_(REPORT_STATUSES)) \
+        .order_by(File.sla_deadline)
+
+    p = canvas.Canvas(out_path, pagesize=landscape(letter))
+    width, height = landscape(letter)
+    y = _draw_header(p, height, section_name, now)
+    count = 0
+
+    with _engine(database_uri).connect() as conn:
+        result = conn.execution_options(yield_per=chunk_size).execute(query)
+        for rows in result.partitions():
+            for row in rows:
+                if y < 40:
+                    p.showPage()
+                    y = _draw_header(p, height, section_name, now)
+
+                p.setFont("Helvetica", 9)
+                p.setFillColor(colors.red if row.status == 'Overdue' else colors.black)
+                values = [
+                    row.filename[:48],
+                    row.priority or '-',
+                    row.status,
+                    row.upload_date.strftime('%Y-%m-%d') if row.upload_date else '-',
+                    row.sla_deadline.strftime('%Y-%m-%d %H:%M') if row.sla_deadline else '-',
+                    _sla_used(row.upload_date, row.sla_deadline, now),
+                ]
+                for (_, x), value in zip(COLUMNS, values):
+                    p.drawString(x, y, value)
+                y -= 14
+                count += 1
+
+    if count == 0:
+        p.setFont("Helvetica", 10)
+        p.drawString(40, y, "No pending or overdue files.")
+    p.showPage()
+    p.save()
+    return count
+
+# --- Runs in the web process ----------------------------------------------
+
+def job_folder(app, job_id):
+    folder = os.path.join(app.config['REPORT_FOLDER'], 'jobs', job_id)
+    os.makedirs(folder, exist_ok=True)
+    return folder
+
+def create_job(user, section_id):
+    """Persists a queued job; call submit_job once it is committed."""
+    job = ReportJob(id=uuid.uuid4().hex, user_id=user.id, section_id=section_id, status='Queued')
+    db.session.add(job)
+    db.session.commit()
+    return job
+
+def submit_job(app, job_id):
+    with _pool_lock:
+        _waiting.add(job_id)
+    return _get_coordinator(app).submit(run_job, app, job_id)
+
+def _heartbeat(job_id):
+    """Marks the running job and every job still waiting behind it in this process as alive."""
+    with _pool_lock:
+        job_ids = [job_id, *_waiting]
+    db.session.execute(
+        update(ReportJob)
+        .where(ReportJob.id.in_(job_ids), ReportJob.status.in_(['Queued', 'Running']))
+        .values(heartbeat_at=datetime.utcnow())
+        .execution_options(synchronize_session=False)
+    )
+    db.session.commit()
+
+def _finish(job_id, **values):
+    """Records the outcome unless fail_stale_jobs has already given up on the job."""
+    finished = db.session.execute(
+        update(ReportJob)
+        .where(ReportJob.id == job_id, ReportJob.status == 'Running')
+        .values(finished_at=datetime.utcnow(), **values)
+        .execution_options(synchronize_session=False)
+    ).rowcount
+    db.session.commit()
+    if not finished:
+        print(f"Report job {job_id} finished after it was marked as failed; result discarded")
+
+def _merge(part_paths, out_path):
+    writer = PdfWriter()
+    for path in part_paths:
+        writer.append(path)
+    with open(out_path + '.tmp', 'wb') as f:
+        writer.write(f)
+    os.replace(out_path + '.tmp', out_path)
+
+def run_job(app, job_id):
+    """
+    Fans the job out to the process pool, one task per section in scope, waits
+    for all of them and merges the parts in section order. The job's heartbeat
+    is refreshed every REPORT_JOB_HEARTBEAT_SECONDS while it waits.
+    """
+    with _pool_lock:
+        _waiting.discard(job_id)
+
+    with app.app_context():
+        claimed = db.session.execute(
+            update(ReportJob)
+            .where(ReportJob.id == job_id, ReportJob.status == 'Queued')
+            .values(status='Running', heartbeat_at=datetime.utcnow())
+            .execution_options(synchronize_session=False)
+        ).rowcount
+        db.session.commit()
+        if not claimed:
+            return
+        job = db.session.get(ReportJob, job_id)
+
+        sections = Section.query.order_by(Section.id)
+        if job.section_id:
+            sections = sections.filter_by(id=job.section_id)
+        sections = [(section.id, section.name) for section in sections]
+
+        folder = job_folder(app, job_id)
+        database_uri = db.engine.url.render_as_string(hide_password=False)
+        chunk_size = app.config.get('REPORT_ROW_CHUNK', 500)
+        heartbeat = app.config.get('REPORT_JOB_HEARTBEAT_SECONDS', 60)
+        now = datetime.utcnow()
+
+        try:
+            pool = _get_process_pool(app)
+            futures = []
+            for section_id, section_name in sections:
+                part_path = os.path.join(folder, f"section-{section_id}.pdf")
+                futures.append((part_path, pool.submit(
+                    render_section_report, database_uri, section_id, section_name, part_path, now, chunk_size
+                )))
+
+            not_done = [future for _, future in futures]
+            while not_done:
+                _, not_done = wait(not_done, timeout=heartbeat)
+                if not_done:
+                    _heartbeat(job_id)
+            rows = sum(future.result() for _, future in futures)
+
+            out_path = os.path.join(folder, 'report.pdf')
+            _merge([part_path for part_path, _ in futures], out_path)
+            for part_path, _ in futures:
+                os.remove(part_path)
+
+            print(f"Report job {job_id}: {rows} file(s) across {len(sections)} section(s)")
+            _finish(job_id, status='Done', file_path=out_path)
+        except Exception as e:
+            if isinstance(e, BrokenProcessPool):
+                # A worker died; start a fresh pool for the next job
+                _reset_process_pool()
+            print(f"Report job {job_id} failed: {e}")
+            db.session.rollback()
+            _finish(job_id, status='Failed', error=str(e)[:255])
+
+def fail_stale_jobs(app):
+    """
+    Scheduler job: the coordinator thread lives in the process that took the
+    request, so a restart leaves its jobs Queued/Running for good. Jobs whose
+    heartbeat is older than REPORT_JOB_STALE_MINUTES are marked Failed so
+    clients stop polling and resubmit; queued and running jobs in a live
+    process keep theirs fresh. Returns the number of jobs failed.
+    """
+    with app.app_context():
+        now = datetime.utcnow()
+        cutoff = now - timedelta(minutes=app.config.get('REPORT_JOB_STALE_MINUTES', 60))
+        failed = db.session.execute(
+            update(ReportJob)
+            .where(ReportJob.status.in_(['Queued', 'Running']), ReportJob.heartbeat_at < cutoff)
+            .values(status='Failed', error='Interrupted before it finished; please submit it again', finished_at=now)
+            .execution_options(synchronize_session=False)
+        ).rowcount
+        db.session.commit()
+
+    if failed:
+        print(f"Marked {failed} interrupted report job(s) as failed")
+    return failed
+
+def prune_jobs(app):
+    """
+    Scheduler job: deletes finished jobs older than REPORT_KEEP_DAYS along
+    with their folders, so merged reports do not pile up on disk.
+    Returns the number of jobs deleted.
+    """
+    with app.app_context():
+        cutoff = datetime.utcnow() - timedelta(days=app.config.get('REPORT_KEEP_DAYS', 30))
+        job_ids = [row.id for row in db.session.query(ReportJob.id)
+                   .filter(ReportJob.status.in_(['Done', 'Failed']), ReportJob.finished_at < cutoff)]
+        if not job_ids:
+            return 0
+
+        # Rows first: a download racing the prune then gets a 404 rather than a missing file
+        db.session.execute(
+            delete(ReportJob).where(ReportJob.id.in_(job_ids)).execution_options(synchronize_session=False)
+        )
+        db.session.commit()
+        jobs_folder = os.path.join(app.config['REPORT_FOLDER'], 'jobs')
+        for job_id in job_ids:
+            shutil.rmtree(os.path.join(jobs_folder, job_id), ignore_errors=True)
+
+    print(f"Pruned {len(job_ids)} finished report job(s)")
+    return len(job_ids)
+
+def serialize_job(job):
+    return {
+        'job_id': job.id,
+        'status': job.status,
+        'section_id': job.section_id,
+        'created_at': job.created_at.isoformat() if job.created_at else None,
+        'finished_at': job.finished_at.isoformat() if job.finished_at else None,
+        'error': job.error
+    }
@@ -0,0 +1,171 @@
+import glob
+import hashlib
+import io
+import json
+import os
+import uuid
+from datetime import datetime, timedelta
+from flask import current_app
+from reportlab.lib.pagesizes import letter
+from reportlab.pdfgen import canvas
+from reportlab.lib import colors
+from app.services.stats_service import get_statistics
+
+# Daily reports are cached on disk as <REPORT_FOLDER>/daily/<date>-<fingerprint>.pdf.
+# The fingerprint is a hash of the counts in the report, so a new file is only
+# rendered when those counts change, and it doubles as the ETag.
+
+def render_daily_report(stats, report_date):
+    """Draws the daily report for `stats` (as returned by get_statistics) and returns the PDF bytes."""
+    buffer = io.BytesIO()
+    p = canvas.Canvas(buffer, pagesize=letter)
+    width, height = letter
+
+    # Title
+    p.setFillColor(colors.darkblue)
+    p.setFont("Helvetica-Bold", 18)
+    p.drawString(50, height - 50, f"Daily File Status Report")
+    p.setFont("Helvetica", 12)
+    p.setFillColor(colors.black)
+    p.drawString(50, height - 70, f"Date: {report_date.strftime('%Y-%m-%d')}")
+
+    # Stats
+    total = stats['overview']['total']
+    pending = stats['overview']['pending']
+    completed = stats['overview']['completed']
+    overdue = stats['overview']['overdue']
+
+    y = height - 120
+
+    # Draw colored stats
+    # Total
+    p.setFont("Helvetica-Bold", 14)
+    p.setFillColor(colors.blue)
+    p.drawString(50, y, f"Total: {total}")
+
+    # Completed
+    p.setFillColor(colors.green)
+    p.drawString(200, y, f"Completed: {completed}")
+
+    # Pending
+    p.setFillColor(colors.orange)
+    p.drawString(350, y, f"Pending: {pending}")
+
+    # Overdue
+    p.setFillColor(colors.red)
+    p.drawString(500, y, f"Overdue: {overdue}")
+
+    y -= 20
+    p.setStrokeColor(colors.lightgrey)
+    p.line(50, y, 550, y)
+
+    # Section Breakdown
+    y -= 40
+    p.setFillColor(colors.black)
+    p.setFont("Helvetica-Bold", 14)
+    p.drawString(50, y, "Section Breakdown")
+    y -= 30
+
+    p.setFont("Helvetica", 11)
+
+    for section in stats['sections']:
+        s_total = section['total']
+        s_pending = section['pending']
+        s_completed = section['completed']
+        s_overdue = section['overdue']
+
+        # Section Name
+        p.setFillColor(colors.black)
+        p.setFont("Helvetica-Bold", 11)
+        p.drawString(60, y, f"Section: {section['name']}")
+
+        # Stats for section
+        p.setFont("Helvetica", 10)
+        p.setFillColor(colors.blue)
+        p.drawString(200, y, f"Total: {s_total}")
+
+        p.setFillColor(colors.green)
+        p.drawString(280, y, f"Completed: {s_completed}")
+
+        p.setFillColor(colors.orange)
+        p.drawString(380, y, f"Pending: {s_pending}")
+
+        p.setFillColor(colors.red)
+        p.drawString(470, y, f"Overdue: {s_overdue}")
+
+        y -= 25
+        if y < 50:
+            p.showPage()
+            y = height - 50
+
+    p.showPage()
+    p.save()
+
+    return buffer.getvalue()
+
+def fingerprint(stats):
+    payload = json.dumps(stats, sort_keys=True)
+    return hashlib.sha256(payload.encode()).hexdigest()[:16]
+
+def _daily_folder(app):
+    folder = os.path.join(app.config['REPORT_FOLDER'], 'daily')
+    os.makedirs(folder, exist_ok=True)
+    return folder
+
+# A superseded report is kept this long after its replacement was written, so a
+# request that was handed its path just before still finds the file
+SUPERSEDED_GRACE = timedelta(minutes=5)
+
+def _prune(folder, keep_path, keep_days):
+    """
+    Removes superseded reports for the same day and reports older than keep_days.
+    Only the scheduler job calls this; request threads never delete reports.
+    """
+    keep_name = os.path.basename(keep_path)
+    cutoff = (datetime.utcnow() - timedelta(days=keep_days)).strftime('%Y-%m-%d')
+    superseded_since = datetime.utcnow() - datetime.utcfromtimestamp(os.path.getmtime(keep_path))
+    for path in glob.glob(os.path.join(folder, '*.pdf')):
+        name = os.path.basename(path)
+        if name == keep_name:
+            continue
+        superseded = name[:10] == keep_name[:10] and superseded_since > SUPERSEDED_GRACE
+        if superseded or name[:10] < cutoff:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+def get_daily_report(app=None, force=False):
+    """
+    Returns the path of today's report for the current counts, rendering it
+    only if no file exists for them yet (or `force` is set). The counts come
+    from section_status_counts, so checking freshness is cheap.
+    """
+    app = app or current_app._get_current_object()
+    with app.app_context():
+        stats = get_statistics()
+
+    today = datetime.utcnow().date()
+    folder = _daily_folder(app)
+    path = os.path.join(folder, f"{today.isoformat()}-{fingerprint(stats)}.pdf")
+    if os.path.exists(path) and not force:
+        return path
+
+    # Write to a temporary name first so readers never see a partial file
+    tmp_path = f"{path}.{uuid.uuid4().hex}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(render_daily_report(stats, today))
+    os.replace(tmp_path, path)
+    print(f"Rendered daily report {os.path.basename(path)}")
+    return path
+
+def refresh_daily_report(app):
+    """
+    Scheduler job: renders today's report if the counts changed since the
+    last one, then removes the reports it replaces.
+    """
+    try:
+        path = get_daily_report(app)
+        _prune(os.path.dirname(path), path, app.config.get('REPORT_KEEP_DAYS', 30))
+    except Exception as e:
+        print(f"Daily report refresh failed: {e}")
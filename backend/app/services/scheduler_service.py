@@ -1,46 +1,271 @@
 from app import db
-from app.models import File, Alert, Escalation
+from app.models import File, Alert
+from app.services import chunked_upload, counter_service, escalation_service, report_service, report_job_service
+from app.services.deadline_scheduler import DeadlineScheduler
+from app.services.lease_service import LeaderElector
+from collections import Counter
 from datetime import datetime, timedelta
-from flask import current_app
+from sqlalchemy import DateTime, String, and_, cast, insert, literal, or_, select, update
+
+# Pending files get a reminder once less than this is left before the deadline
+REMINDER_WINDOW = timedelta(days=1)
+
+_deadline_scheduler = None
+# When the heap last read the database, and how far back each refresh looks before that
+_refreshed_at = None
+REFRESH_OVERLAP = timedelta(minutes=2)
+_jobs = None
+_leader = None
+
+def _guarded_update(guard, new_values):
+    """
+    Runs the guarded UPDATE and returns (id, section_id, is_deleted) for exactly
+    the rows it changed. Uses UPDATE ... RETURNING where the dialect has it,
+    otherwise locks the rows with SELECT ... FOR UPDATE under the same guard first.
+    """
+    columns = (File.id, File.section_id, File.is_deleted)
+    statement = update(File).where(guard).values(**new_values).execution_options(synchronize_session=False)
+    if db.engine.dialect.update_returning:
+        return db.session.execute(statement.returning(*columns)).all()
+
+    rows = db.session.query(*columns).filter(guard).with_for_update().all()
+    if rows:
+        db.session.execute(update(File).where(File.id.in_([row.id for row in rows]))
+                           .values(**new_values).execution_options(synchronize_session=False))
+    return rows
+
+def _sweep_batch(candidates, new_values, message_parts, now):
+    """
+    Moves one batch of files with bulk statements: UPDATE the files, then
+    INSERT ... SELECT the alerts for the rows actually updated. `candidates`
+    is a query of file ids. Returns the number of files updated.
+    """
+    ids = [row.id for row in candidates.all()]
+    if not ids:
+        return 0
+
+    # Guard against rows that changed since they were selected; counters and
+    # alerts follow the rows the UPDATE really changed, not the selection
+    moved = _guarded_update(and_(File.id.in_(ids), File.status == 'Pending'), new_values)
+    if not moved:
+        return 0
+
+    message = literal(message_parts[0]) + File.filename + literal(message_parts[1]) + cast(File.sla_deadline, String)
+    db.session.execute(
+        insert(Alert).from_select(
+            ['file_id', 'message', 'created_at', 'is_read'],
+            select(File.id, message, literal(now, DateTime), literal(False))
+            .where(File.id.in_([row.id for row in moved]))
+        )
+    )
+
+    if new_values.get('status'):
+        per_section = Counter(row.section_id for row in moved if not row.is_deleted)
+        for section_id, count in per_section.items():
+            counter_service.record_transition(section_id, 'Pending', new_values['status'], count)
+
+    db.session.commit()
+    return len(moved)
+
+def overdue_candidates_query(now, limit):
+    """Ids of the next `limit` Pending files whose deadline has passed, earliest first."""
+    return db.session.query(File.id) \
+        .filter(File.status == 'Pending', File.is_deleted == False, File.sla_deadline < now) \
+        .order_by(File.sla_deadline).limit(limit)
+
+def reminder_candidates_query(now, limit):
+    """Ids of the next `limit` Pending files within REMINDER_WINDOW of their deadline and not yet reminded."""
+    return db.session.query(File.id) \
+        .filter(
+            File.status == 'Pending',
+            File.is_deleted == False,
+            File.sla_deadline >= now,
+            File.sla_deadline < now + REMINDER_WINDOW,
+            or_(File.reminder_sent == False, File.reminder_sent.is_(None))
+        ) \
+        .order_by(File.sla_deadline).limit(limit)
 
 def check_sla_status(app):
     """
     Checks for files that are near deadline or overdue.
+    Works set-based in batches of SLA_SWEEP_BATCH_SIZE, committing after each
+    batch so the write lock is held briefly. Returns the number of files moved
+    to Overdue, the number of reminders sent and the number of files escalated.
     """
     with app.app_context():
-        # Get pending files
-        pending_files = File.query.filter_by(status='Pending').all()
+        batch_size = app.config.get('SLA_SWEEP_BATCH_SIZE', 500)
         now = datetime.utcnow()
-        
-        for file in pending_files:
-            if not file.sla_deadline:
-                continue
-                
-            # Check for Overdue
-            if now > file.sla_deadline:
-                file.status = 'Overdue'
-                file.overdue_level = 1 # Initial overdue
-                
-                # Create Alert
-                alert = Alert(
-                    file_id=file.id,
-                    message=f"File {file.filename} is OVERDUE! Deadline was {file.sla_deadline}"
-                )
-                db.session.add(alert)
-                
-            # Check for Nearing Deadline (e.g. 1 day left)
-            elif (file.sla_deadline - now) < timedelta(days=1) and not file.reminder_sent:
-                file.reminder_sent = True
-                alert = Alert(
-                    file_id=file.id,
-                    message=f"File {file.filename} is nearing deadline. Due: {file.sla_deadline}"
-                )
-                db.session.add(alert)
-                
-        db.session.commit()
+        result = {'overdue': 0, 'reminders': 0}
 
-def start_scheduler(app):
+        # Overdue: deadline has passed
+        while True:
+            candidates = overdue_candidates_query(now, batch_size)
+            updated = _sweep_batch(candidates, {'status': 'Overdue'},
+                                   ('File ', ' is OVERDUE! Deadline was '), now)
+            if not updated:
+                break
+            result['overdue'] += updated
+
+        # Nearing deadline: less than a day left and no reminder yet
+        while True:
+            candidates = reminder_candidates_query(now, batch_size)
+            updated = _sweep_batch(candidates, {'reminder_sent': True},
+                                   ('File ', ' is nearing deadline. Due: '), now)
+            if not updated:
+                break
+            result['reminders'] += updated
+
+        # Overdue files past their escalation thresholds
+        result['escalations'] = escalation_service.escalate_due(app, now, batch_size)
+
+        print(f"SLA sweep: {result['overdue']} file(s) overdue, {result['reminders']} reminder(s) sent, "
+              f"{result['escalations']} file(s) escalated")
+        return result
+
+def _instants(file, thresholds):
+    """Instants at which the sweep has work to do for `file` (a File or a row with the same columns)."""
+    instants = []
+    if file.status == 'Pending':
+        instants.append(('deadline', file.sla_deadline))
+        if not file.reminder_sent:
+            instants.append(('reminder', file.sla_deadline - REMINDER_WINDOW))
+    for instant in escalation_service.escalation_instants(file.priority, file.sla_deadline, file.escalation_level, thresholds):
+        instants.append(('escalation', instant))
+    return instants
+
+def _deadline_rows(since=None):
+    query = db.session.query(File.id, File.status, File.priority, File.sla_deadline,
+                             File.reminder_sent, File.escalation_level) \
+        .filter(File.status.in_(['Pending', 'Overdue']), File.is_deleted == False, File.sla_deadline.isnot(None))
+    if since is not None:
+        query = query.filter(File.extraction_updated_at >= since)
+    return query.all()
+
+def load_deadlines(app):
+    """
+    Reloads the whole deadline heap from the database. Runs on election and
+    every SLA_RESYNC_MINUTES as a safety net; refresh_deadlines picks up new
+    files in between.
+    """
+    global _refreshed_at
+    if _deadline_scheduler is None:
+        return
+    with app.app_context():
+        thresholds = escalation_service.get_thresholds(app)
+        started = datetime.utcnow()
+        try:
+            rows = _deadline_rows()
+        except Exception as e:
+            # e.g. tables not created yet; the next resync tries again
+            print(f"Could not load SLA deadlines: {e}")
+            return
+    _deadline_scheduler.replace_all(
+        (row.id, row.sla_deadline, _instants(row, thresholds)) for row in rows
+    )
+    _refreshed_at = started
+
+def refresh_deadlines(app):
+    """
+    Adds deadlines set by other processes since the last load. Web workers
+    running with SCHEDULER_ENABLED=false cannot notify the leader directly, so
+    it polls, every SLA_REFRESH_SECONDS, for files whose SLA was applied
+    recently (extraction_updated_at is stamped in the same commit). The window
+    overlaps the previous one so commits that land late are not missed;
+    scheduling a file twice just replaces its entry. Completed and deleted
+    files are not polled for: their entries fire a sweep that finds nothing.
+    """
+    global _refreshed_at
+    if _deadline_scheduler is None or _refreshed_at is None:
+        return
+    with app.app_context():
+        thresholds = escalation_service.get_thresholds(app)
+        started = datetime.utcnow()
+        for row in _deadline_rows(since=_refreshed_at - REFRESH_OVERLAP):
+            _deadline_scheduler.schedule(row.id, row.sla_deadline, _instants(row, thresholds))
+    _refreshed_at = started
+
+def notify_deadline(file):
+    """Call after committing a Pending file with a new SLA deadline."""
+    if _deadline_scheduler is not None and file.sla_deadline:
+        thresholds = escalation_service.get_thresholds()
+        _deadline_scheduler.schedule(file.id, file.sla_deadline, _instants(file, thresholds))
+
+def cancel_deadline(file_id):
+    """Call after a file leaves SLA monitoring (completed or deleted)."""
+    if _deadline_scheduler is not None:
+        _deadline_scheduler.cancel(file_id)
+
+def _start_jobs(app):
+    """Starts the scheduled jobs in this process; runs once it becomes the leader."""
+    global _deadline_scheduler, _jobs
     from apscheduler.schedulers.background import BackgroundScheduler
-    scheduler = BackgroundScheduler()
-    scheduler.add_job(func=check_sla_status, args=[app], trigger="interval", minutes=60, id='sla_check', replace_existing=True)
-    scheduler.start()
+
+    _deadline_scheduler = DeadlineScheduler(lambda due: check_sla_status(app))
+    load_deadlines(app)
+    _deadline_scheduler.start()
+
+    _jobs = BackgroundScheduler()
+    _jobs.add_job(func=load_deadlines, args=[app], trigger="interval",
+                  minutes=app.config.get('SLA_RESYNC_MINUTES', 60), id='sla_resync', replace_existing=True)
+    _jobs.add_job(func=refresh_deadlines, args=[app], trigger="interval",
+                  seconds=app.config.get('SLA_REFRESH_SECONDS', 30), id='sla_refresh', replace_existing=True)
+    # Picks up uploads whose extraction was lost with the process that queued it
+    # (imported here: extraction_service imports this module)
+    from app.services.extraction_service import recover_stale_extractions
+    _jobs.add_job(func=recover_stale_extractions, args=[app], trigger="interval",
+                  minutes=app.config.get('EXTRACTION_STALE_MINUTES', 15), id='extraction_recovery',
+                  next_run_time=datetime.now(), replace_existing=True)
+    # Fails report jobs whose coordinating process went away
+    _jobs.add_job(func=report_job_service.fail_stale_jobs, args=[app], trigger="interval",
+                  minutes=app.config.get('REPORT_JOB_STALE_MINUTES', 60), id='report_job_recovery',
+                  next_run_time=datetime.now(), replace_existing=True)
+    # Deletes finished report jobs (and their PDFs) older than REPORT_KEEP_DAYS
+    _jobs.add_job(func=report_job_service.prune_jobs, args=[app], trigger="interval",
+                  hours=24, id='report_job_prune', next_run_time=datetime.now(), replace_existing=True)
+    # Deletes chunked uploads the client never finished or aborted
+    _jobs.add_job(func=chunked_upload.expire_sessions, args=[app], trigger="interval",
+                  hours=1, id='upload_session_expiry', next_run_time=datetime.now(), replace_existing=True)
+    # Renders today's report on election and whenever the counts have changed since
+    _jobs.add_job(func=report_service.refresh_daily_report, args=[app], trigger="interval",
+                  minutes=app.config.get('REPORT_REFRESH_MINUTES', 15), id='daily_report',
+                  next_run_time=datetime.now(), replace_existing=True)
+    _jobs.start()
+
+def _stop_jobs():
+    global _deadline_scheduler, _jobs
+    if _jobs is not None:
+        _jobs.shutdown(wait=False)
+        _jobs = None
+    if _deadline_scheduler is not None:
+        _deadline_scheduler.stop()
+        _deadline_scheduler = None
+
+def start_scheduler(app):
+    """
+    Joins the election for the scheduler lease. Only the process holding it
+    runs the jobs, so any number of web workers (and the standalone
+    scheduler.py) can call this safely.
+
+    While leader, check_sla_status runs whenever the next SLA deadline or
+    reminder instant is due. Deadlines notified in this process are scheduled
+    at once; files uploaded through other processes are picked up every
+    SLA_REFRESH_SECONDS, and the whole heap is reloaded every SLA_RESYNC_MINUTES.
+    """
+    global _leader
+    if _leader is None:
+        _leader = LeaderElector(
+            app, 'scheduler',
+            on_elected=lambda: _start_jobs(app),
+            on_demoted=_stop_jobs,
+            ttl=app.config.get('SCHEDULER_LEASE_TTL', 60),
+            heartbeat=app.config.get('SCHEDULER_HEARTBEAT', 20)
+        )
+        _leader.start()
+    return _leader
+
+def stop_scheduler():
+    """Stops the jobs and hands the lease over straight away instead of letting it expire."""
+    global _leader
+    if _leader is not None:
+        _leader.stop()
+        _leader = None
@@ -0,0 +1,21 @@
+from datetime import datetime, timedelta
+
+# SLA window (in days) per priority level
+SLA_DAYS = {'Critical': 1, 'High': 3, 'Medium': 5, 'Low': 7}
+
+def calculate_sla_deadline(priority, start=None):
+    """
+    Returns the SLA deadline for a file of the given priority,
+    counted from `start` (defaults to now).
+    """
+    days = SLA_DAYS.get(priority, 5)
+    return (start or datetime.utcnow()) + timedelta(days=days)
+
+def apply_sla(file, priority, start):
+    """
+    Sets the SLA deadline and the stored halfway point on a File row.
+    The halfway point lets alert queries find files past 50% of their SLA
+    with an index range scan.
+    """
+    file.sla_deadline = calculate_sla_deadline(priority, start)
+    file.sla_halfway = start + (file.sla_deadline - start) / 2
@@ -0,0 +1,51 @@
+from app import db
+from app.models import Section, SectionStatusCount
+
+# Statuses broken out in the dashboard and reports; every status counts towards 'total'
+STATUSES = ('Pending', 'Completed', 'Overdue')
+
+def _empty_counts():
+    counts = {'total': 0}
+    for status in STATUSES:
+        counts[status.lower()] = 0
+    return counts
+
+def status_counts(section_id=None):
+    """
+    Reads non-deleted file counts per (section, status) from the incrementally
+    maintained section_status_counts table, so the cost depends on the number
+    of sections rather than the number of files.
+    Returns {section_id: {'total': n, 'pending': n, 'completed': n, 'overdue': n}}.
+    """
+    query = db.session.query(SectionStatusCount.section_id, SectionStatusCount.status, SectionStatusCount.count)
+    if section_id:
+        query = query.filter(SectionStatusCount.section_id == section_id)
+
+    counts = {}
+    for s_id, status, count in query:
+        section_counts = counts.setdefault(s_id, _empty_counts())
+        section_counts['total'] += count
+        if status in STATUSES:
+            section_counts[status.lower()] += count
+    return counts
+
+def get_statistics(section_id=None):
+    """
+    Overall and per-section file counts, optionally scoped to one section.
+    Returns {'overview': {...}, 'sections': [{'id', 'name', ...counts}]}.
+    """
+    counts = status_counts(section_id)
+
+    sections_query = Section.query.order_by(Section.id)
+    if section_id:
+        sections_query = sections_query.filter_by(id=section_id)
+
+    overview = _empty_counts()
+    sections = []
+    for section in sections_query:
+        section_counts = counts.get(section.id, _empty_counts())
+        for key, value in section_counts.items():
+            overview[key] += value
+        sections.append({'id': section.id, 'name': section.name, **section_counts})
+
+    return {'overview': overview, 'sections': sections}
@@ -9,3 +9,77 @@ class Config:
     SQLALCHEMY_TRACK_MODIFICATIONS = False
     UPLOAD_FOLDER = os.path.join(os.getcwd(), 'uploads')
     GEMINI_API_KEY = os.environ.get('GEMINI_API_KEY')
+    # Number of background threads running metadata extraction
+    EXTRACTION_WORKERS = int(os.environ.get('EXTRACTION_WORKERS', 4))
+    # Extractions stuck in Queued/Running this long (e.g. lost in a restart) are queued again;
+    # after EXTRACTION_MAX_ATTEMPTS times as long the file gets the default priority and SLA
+    EXTRACTION_STALE_MINUTES = int(os.environ.get('EXTRACTION_STALE_MINUTES', 15))
+    EXTRACTION_MAX_ATTEMPTS = int(os.environ.get('EXTRACTION_MAX_ATTEMPTS', 3))
+    GEMINI_MODEL = os.environ.get('GEMINI_MODEL', 'gemini-2.0-flash')
+    # Extraction result cache limits (entries beyond the limit are evicted least recently used first)
+    EXTRACTION_CACHE_MAX_ENTRIES = int(os.environ.get('EXTRACTION_CACHE_MAX_ENTRIES', 10000))
+    EXTRACTION_CACHE_MAX_AGE_DAYS = int(os.environ.get('EXTRACTION_CACHE_MAX_AGE_DAYS', 90))
+    # Batch uploads: max files per request and threads used for their extraction
+    BATCH_UPLOAD_MAX_FILES = int(os.environ.get('BATCH_UPLOAD_MAX_FILES', 50))
+    BATCH_EXTRACTION_WORKERS = int(os.environ.get('BATCH_EXTRACTION_WORKERS', 8))
+    # Chunked uploads not appended to for this long are deleted along with their part files
+    UPLOAD_SESSION_MAX_AGE_HOURS = int(os.environ.get('UPLOAD_SESSION_MAX_AGE_HOURS', 24))
+    # Gemini client limits
+    GEMINI_MAX_CONCURRENCY = int(os.environ.get('GEMINI_MAX_CONCURRENCY', 4))
+    GEMINI_RATE_PER_SECOND = float(os.environ.get('GEMINI_RATE_PER_SECOND', 2))
+    GEMINI_BURST = int(os.environ.get('GEMINI_BURST', 5))
+    GEMINI_TIMEOUT = float(os.environ.get('GEMINI_TIMEOUT', 30)) # seconds per attempt
+    GEMINI_MAX_RETRIES = int(os.environ.get('GEMINI_MAX_RETRIES', 2))
+    GEMINI_BACKOFF_BASE = float(os.environ.get('GEMINI_BACKOFF_BASE', 0.5))
+    GEMINI_BREAKER_THRESHOLD = int(os.environ.get('GEMINI_BREAKER_THRESHOLD', 5)) # consecutive failures
+    GEMINI_BREAKER_RESET = float(os.environ.get('GEMINI_BREAKER_RESET', 60)) # seconds before a probe call
+    # Extractor backends tried in order until a date is found (see app/services/extractors)
+    EXTRACTOR_BACKENDS = os.environ.get('EXTRACTOR_BACKENDS', 'local,gemini')
+    # Maximum number of PDF pages scanned by local extraction (0 or unset scans every page)
+    PDF_SCAN_MAX_PAGES = int(os.environ.get('PDF_SCAN_MAX_PAGES', 20)) or None
+    # Payload shrinking before files are sent to the model
+    MODEL_IMAGE_MAX_DIM = int(os.environ.get('MODEL_IMAGE_MAX_DIM', 1600)) # longest side, in pixels
+    MODEL_IMAGE_QUALITY = int(os.environ.get('MODEL_IMAGE_QUALITY', 80)) # JPEG quality
+    MODEL_PDF_MAX_PAGES = int(os.environ.get('MODEL_PDF_MAX_PAGES', 5))
+    # File listing page sizes
+    FILE_LIST_PAGE_SIZE = int(os.environ.get('FILE_LIST_PAGE_SIZE', 50))
+    FILE_LIST_MAX_PAGE_SIZE = int(os.environ.get('FILE_LIST_MAX_PAGE_SIZE', 200))
+    # Dashboard result cache: 'memory' (per process) or 'redis' (shared, needs CACHE_REDIS_URL)
+    DASHBOARD_CACHE_BACKEND = os.environ.get('DASHBOARD_CACHE_BACKEND', 'memory')
+    DASHBOARD_CACHE_TTL = float(os.environ.get('DASHBOARD_CACHE_TTL', 30)) # seconds
+    CACHE_REDIS_URL = os.environ.get('CACHE_REDIS_URL')
+    # SLA analytics are recomputed at most this often (seconds), or when a file changes status
+    ANALYTICS_CACHE_TTL = int(os.environ.get('ANALYTICS_CACHE_TTL', 300))
+    # Dashboard alert list size
+    ALERTS_DEFAULT_LIMIT = int(os.environ.get('ALERTS_DEFAULT_LIMIT', 100))
+    ALERTS_MAX_LIMIT = int(os.environ.get('ALERTS_MAX_LIMIT', 500))
+    # Files moved per batch (and per commit) by the SLA sweep
+    SLA_SWEEP_BATCH_SIZE = int(os.environ.get('SLA_SWEEP_BATCH_SIZE', 500))
+    # SLA transitions run when a deadline is due. The leader's deadline heap picks up files
+    # uploaded through other processes every SLA_REFRESH_SECONDS (so their reminders can be
+    # up to that late) and is fully reloaded every SLA_RESYNC_MINUTES
+    SLA_REFRESH_SECONDS = int(os.environ.get('SLA_REFRESH_SECONDS', 30))
+    SLA_RESYNC_MINUTES = int(os.environ.get('SLA_RESYNC_MINUTES', 60))
+    # Set to 'false' on web workers when scheduler.py runs the jobs instead
+    SCHEDULER_ENABLED = os.environ.get('SCHEDULER_ENABLED', 'true') == 'true'
+    # Only the process holding the scheduler lease runs jobs; it renews every
+    # SCHEDULER_HEARTBEAT seconds and others take over SCHEDULER_LEASE_TTL seconds after it stops
+    SCHEDULER_LEASE_TTL = int(os.environ.get('SCHEDULER_LEASE_TTL', 60))
+    SCHEDULER_HEARTBEAT = int(os.environ.get('SCHEDULER_HEARTBEAT', 20))
+    # JSON object of hours past the deadline per escalation level, per priority,
+    # e.g. '{"Critical": [4, 24]}'; priorities not listed keep the defaults in escalation_service
+    ESCALATION_THRESHOLDS = os.environ.get('ESCALATION_THRESHOLDS')
+    # Rendered daily reports (see report_service); the scheduler re-renders when counts change
+    REPORT_FOLDER = os.environ.get('REPORT_FOLDER') or os.path.join(os.getcwd(), 'reports')
+    REPORT_REFRESH_MINUTES = int(os.environ.get('REPORT_REFRESH_MINUTES', 15))
+    # Daily reports and finished report jobs are deleted after this many days
+    REPORT_KEEP_DAYS = int(os.environ.get('REPORT_KEEP_DAYS', 30))
+    # Detailed report jobs: worker processes rendering sections, and rows fetched per database round trip
+    REPORT_WORKERS = int(os.environ.get('REPORT_WORKERS', 2))
+    REPORT_ROW_CHUNK = int(os.environ.get('REPORT_ROW_CHUNK', 500))
+    # Queued/Running report jobs refresh a heartbeat this often; jobs whose heartbeat is older than
+    # REPORT_JOB_STALE_MINUTES are assumed lost in a restart and marked Failed
+    REPORT_JOB_HEARTBEAT_SECONDS = int(os.environ.get('REPORT_JOB_HEARTBEAT_SECONDS', 60))
+    REPORT_JOB_STALE_MINUTES = int(os.environ.get('REPORT_JOB_STALE_MINUTES', 60))
+    # Rows fetched per database round trip by the streaming export
+    EXPORT_CHUNK_SIZE = int(os.environ.get('EXPORT_CHUNK_SIZE', 1000))
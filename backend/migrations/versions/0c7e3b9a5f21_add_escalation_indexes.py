@@ -0,0 +1,35 @@
+"""Add escalation index and unique escalation level per file
+
+Revision ID: 0c7e3b9a5f21
+Revises: f2c8a61d4b93
+Create Date: 2026-10-18 16:24:09.731552
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0c7e3b9a5f21'
+down_revision = 'f2c8a61d4b93'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # The escalation query matches escalation_level exactly, so older rows need a value
+    op.execute("UPDATE file SET escalation_level = 0 WHERE escalation_level IS NULL")
+
+    with op.batch_alter_table('file', schema=None) as batch_op:
+        batch_op.create_index('ix_file_escalation', ['status', 'is_deleted', 'priority', 'escalation_level', 'sla_deadline'], unique=False)
+
+    with op.batch_alter_table('escalation', schema=None) as batch_op:
+        batch_op.create_unique_constraint('uq_escalation_file_level', ['file_id', 'level'])
+
+
+def downgrade():
+    with op.batch_alter_table('escalation', schema=None) as batch_op:
+        batch_op.drop_constraint('uq_escalation_file_level', type_='unique')
+
+    with op.batch_alter_table('file', schema=None) as batch_op:
+        batch_op.drop_index('ix_file_escalation')
@@ -0,0 +1,29 @@
+"""Add file extraction status
+
+Revision ID: 3f2a9c1d7b44
+Revises: 96d0ec18b060
+Create Date: 2026-10-18 09:12:04.511230
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3f2a9c1d7b44'
+down_revision = '96d0ec18b060'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('file', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('extraction_status', sa.String(length=20), nullable=True))
+
+    # Files uploaded before the extraction pipeline were extracted inline
+    op.execute("UPDATE file SET extraction_status = 'Done'")
+
+
+def downgrade():
+    with op.batch_alter_table('file', schema=None) as batch_op:
+        batch_op.drop_column('extraction_status')
@@ -0,0 +1,41 @@
+"""Add section status counters
+
+Revision ID: 4d9e2b7f6a15
+Revises: e1a7b4c90d32
+Create Date: 2026-10-18 14:21:07.662913
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '4d9e2b7f6a15'
+down_revision = 'e1a7b4c90d32'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('section_status_counts',
+    sa.Column('section_id', sa.Integer(), nullable=False),
+    sa.Column('status', sa.String(length=20), nullable=False),
+    sa.Column('count', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['section_id'], ['section.id'], ),
+    sa.PrimaryKeyConstraint('section_id', 'status')
+    )
+
+    # Seed from existing files; afterwards the table is maintained incrementally.
+    # is_deleted is added outside Alembic (update_db.py), so it may be missing here.
+    file_columns = {column['name'] for column in sa.inspect(op.get_bind()).get_columns('file')}
+    not_deleted = "is_deleted = false AND " if 'is_deleted' in file_columns else ""
+    op.execute(
+        "INSERT INTO section_status_counts (section_id, status, count) "
+        "SELECT section_id, status, COUNT(id) FROM file "
+        f"WHERE {not_deleted}status IS NOT NULL "
+        "GROUP BY section_id, status"
+    )
+
+
+def downgrade():
+    op.drop_table('section_status_counts')
@@ -0,0 +1,29 @@
+"""Add heartbeat_at to report_job for spotting interrupted jobs
+
+Revision ID: 7b2e9d4c1a06
+Revises: d4f0a7c3e962
+Create Date: 2026-10-18 20:12:41.385102
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '7b2e9d4c1a06'
+down_revision = 'd4f0a7c3e962'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('report_job', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('heartbeat_at', sa.DateTime(), nullable=True))
+
+    # Existing jobs count from their creation time
+    op.execute("UPDATE report_job SET heartbeat_at = created_at WHERE heartbeat_at IS NULL")
+
+
+def downgrade():
+    with op.batch_alter_table('report_job', schema=None) as batch_op:
+        batch_op.drop_column('heartbeat_at')
@@ -0,0 +1,28 @@
+"""Add file content hash
+
+Revision ID: 8b61e0f4a2d9
+Revises: 3f2a9c1d7b44
+Create Date: 2026-10-18 10:03:41.227915
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '8b61e0f4a2d9'
+down_revision = '3f2a9c1d7b44'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('file', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('content_hash', sa.String(length=64), nullable=True))
+        batch_op.create_index(batch_op.f('ix_file_content_hash'), ['content_hash'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('file', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_file_content_hash'))
+        batch_op.drop_column('content_hash')
@@ -0,0 +1,29 @@
+"""Add extraction_updated_at to file for recovering lost extractions
+
+Revision ID: 9e6b2f4a8c13
+Revises: 5a4d1e8c2b70
+Create Date: 2026-10-18 18:05:27.613940
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '9e6b2f4a8c13'
+down_revision = '5a4d1e8c2b70'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('file', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('extraction_updated_at', sa.DateTime(), nullable=True))
+
+    # Existing rows count from their upload time
+    op.execute("UPDATE file SET extraction_updated_at = upload_date WHERE extraction_updated_at IS NULL")
+
+
+def downgrade():
+    with op.batch_alter_table('file', schema=None) as batch_op:
+        batch_op.drop_column('extraction_updated_at')
@@ -0,0 +1,45 @@
+"""Add file SLA halfway point
+
+Revision ID: a62c5f0e8d17
+Revises: 4d9e2b7f6a15
+Create Date: 2026-10-18 15:02:33.918264
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a62c5f0e8d17'
+down_revision = '4d9e2b7f6a15'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('file', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('sla_halfway', sa.DateTime(), nullable=True))
+
+    # Backfill in Python so the date arithmetic doesn't depend on the database dialect
+    bind = op.get_bind()
+    file_table = sa.table('file',
+        sa.column('id', sa.Integer),
+        sa.column('upload_date', sa.DateTime),
+        sa.column('sla_deadline', sa.DateTime),
+        sa.column('sla_halfway', sa.DateTime)
+    )
+    rows = bind.execute(
+        sa.select(file_table.c.id, file_table.c.upload_date, file_table.c.sla_deadline)
+        .where(file_table.c.upload_date.isnot(None), file_table.c.sla_deadline.isnot(None))
+    ).fetchall()
+    for file_id, upload_date, sla_deadline in rows:
+        bind.execute(
+            file_table.update()
+            .where(file_table.c.id == file_id)
+            .values(sla_halfway=upload_date + (sla_deadline - upload_date) / 2)
+        )
+
+
+def downgrade():
+    with op.batch_alter_table('file', schema=None) as batch_op:
+        batch_op.drop_column('sla_halfway')
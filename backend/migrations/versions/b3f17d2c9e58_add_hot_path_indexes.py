@@ -0,0 +1,57 @@
+"""Add composite indexes for hot query paths
+
+Revision ID: b3f17d2c9e58
+Revises: a62c5f0e8d17
+Create Date: 2026-10-18 15:40:12.407731
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b3f17d2c9e58'
+down_revision = 'a62c5f0e8d17'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # is_deleted and deletion_remarks were added outside Alembic (update_db.py);
+    # create them here on databases that never ran that script
+    file_columns = {column['name'] for column in sa.inspect(op.get_bind()).get_columns('file')}
+    with op.batch_alter_table('file', schema=None) as batch_op:
+        if 'is_deleted' not in file_columns:
+            batch_op.add_column(sa.Column('is_deleted', sa.Boolean(), nullable=True, server_default=sa.false()))
+        if 'deletion_remarks' not in file_columns:
+            batch_op.add_column(sa.Column('deletion_remarks', sa.String(length=255), nullable=True))
+
+    with op.batch_alter_table('file', schema=None) as batch_op:
+        batch_op.create_index('ix_file_listing', ['is_deleted', 'upload_date', 'id'], unique=False)
+        batch_op.create_index('ix_file_section_listing', ['section_id', 'is_deleted', 'upload_date', 'id'], unique=False)
+        batch_op.create_index('ix_file_alerts', ['status', 'is_deleted', 'sla_halfway'], unique=False)
+        batch_op.create_index('ix_file_section_alerts', ['section_id', 'status', 'is_deleted', 'sla_halfway'], unique=False)
+        batch_op.create_index('ix_file_sla_sweep', ['status', 'sla_deadline'], unique=False)
+        batch_op.create_index('ix_file_section_status', ['is_deleted', 'section_id', 'status'], unique=False)
+
+    with op.batch_alter_table('alert', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_alert_file_id'), ['file_id'], unique=False)
+
+    with op.batch_alter_table('escalation', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_escalation_file_id'), ['file_id'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('escalation', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_escalation_file_id'))
+
+    with op.batch_alter_table('alert', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_alert_file_id'))
+
+    with op.batch_alter_table('file', schema=None) as batch_op:
+        batch_op.drop_index('ix_file_section_status')
+        batch_op.drop_index('ix_file_sla_sweep')
+        batch_op.drop_index('ix_file_section_alerts')
+        batch_op.drop_index('ix_file_alerts')
+        batch_op.drop_index('ix_file_section_listing')
+        batch_op.drop_index('ix_file_listing')
@@ -0,0 +1,41 @@
+"""Add extraction cache
+
+Revision ID: c5d83e7a19f0
+Revises: 8b61e0f4a2d9
+Create Date: 2026-10-18 10:47:19.803614
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c5d83e7a19f0'
+down_revision = '8b61e0f4a2d9'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('extraction_cache',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('content_hash', sa.String(length=64), nullable=False),
+    sa.Column('model_name', sa.String(length=64), nullable=False),
+    sa.Column('prompt_version', sa.String(length=20), nullable=False),
+    sa.Column('extracted_date', sa.String(length=10), nullable=True),
+    sa.Column('priority', sa.String(length=20), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('last_used_at', sa.DateTime(), nullable=True),
+    sa.Column('hits', sa.Integer(), nullable=True),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('content_hash', 'model_name', 'prompt_version', name='uq_extraction_cache_key')
+    )
+    with op.batch_alter_table('extraction_cache', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_extraction_cache_last_used_at'), ['last_used_at'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('extraction_cache', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_extraction_cache_last_used_at'))
+
+    op.drop_table('extraction_cache')
@@ -0,0 +1,26 @@
+"""Index file.extraction_updated_at for the scheduler's deadline refresh
+
+Revision ID: d4f0a7c3e962
+Revises: 9e6b2f4a8c13
+Create Date: 2026-10-18 18:40:52.904417
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd4f0a7c3e962'
+down_revision = '9e6b2f4a8c13'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('file', schema=None) as batch_op:
+        batch_op.create_index('ix_file_deadline_refresh', ['extraction_updated_at'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('file', schema=None) as batch_op:
+        batch_op.drop_index('ix_file_deadline_refresh')
@@ -0,0 +1,25 @@
+"""
+Runs the scheduled jobs (SLA transitions) outside the web workers.
+
+    SCHEDULER_ENABLED=false gunicorn -w 4 run:app
+    python scheduler.py
+
+Several copies may run for failover; the scheduler lease lets only one of
+them run jobs at a time.
+"""
+import signal
+import threading
+from app import create_app
+from app.services.scheduler_service import start_scheduler, stop_scheduler
+
+app = create_app()
+
+if __name__ == '__main__':
+    stopped = threading.Event()
+    signal.signal(signal.SIGTERM, lambda *args: stopped.set())
+    signal.signal(signal.SIGINT, lambda *args: stopped.set())
+
+    start_scheduler(app)
+    print("Scheduler running, waiting for the lease")
+    stopped.wait()
+    stop_scheduler()
@@ -0,0 +1,49 @@
+import requests
+import hashlib
+import unittest
+
+BASE_URL = 'http://127.0.0.1:5000/api'
+
+class TestChunkedUpload(unittest.TestCase):
+    def setUp(self):
+        response = requests.post(f'{BASE_URL}/auth/login', json={'username': 'operator', 'password': 'op123'})
+        self.headers = {'Authorization': f'Bearer {response.json().get("token")}'}
+
+    def test_chunked_upload_flow(self):
+        content = b'Grievance received on 12-03-2025\n' * 50000
+        chunk_size = 512 * 1024
+
+        # 1. Init
+        res = requests.post(f'{BASE_URL}/file/upload/chunked', headers=self.headers,
+                            json={'filename': 'chunked.txt', 'section_id': 1, 'total_size': len(content)})
+        self.assertEqual(res.status_code, 201)
+        upload_id = res.json()['upload_id']
+
+        # 2. First chunk, then a chunk at the wrong offset (should be rejected)
+        res = requests.put(f'{BASE_URL}/file/upload/chunked/{upload_id}?offset=0',
+                           data=content[:chunk_size], headers=self.headers)
+        self.assertEqual(res.json()['offset'], chunk_size)
+
+        res = requests.put(f'{BASE_URL}/file/upload/chunked/{upload_id}?offset=0',
+                           data=content[:chunk_size], headers=self.headers)
+        self.assertEqual(res.status_code, 409)
+
+        # 3. Resume from the offset reported by the server
+        offset = requests.get(f'{BASE_URL}/file/upload/chunked/{upload_id}', headers=self.headers).json()['offset']
+        while offset < len(content):
+            res = requests.put(f'{BASE_URL}/file/upload/chunked/{upload_id}?offset={offset}',
+                               data=content[offset:offset + chunk_size], headers=self.headers)
+            self.assertEqual(res.status_code, 200)
+            offset = res.json()['offset']
+
+        # 4. Finalize and download the stored file
+        res = requests.post(f'{BASE_URL}/file/upload/chunked/{upload_id}/finalize', headers=self.headers)
+        self.assertEqual(res.status_code, 201)
+        file_id = res.json()['file_id']
+
+        res = requests.get(f'{BASE_URL}/file/{file_id}/view', headers=self.headers)
+        self.assertEqual(hashlib.sha256(res.content).hexdigest(), hashlib.sha256(content).hexdigest())
+        print(f"Chunked upload stored as file ID: {file_id}")
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,72 @@
+from datetime import datetime
+from app import create_app, db
+from app.models import File, Alert
+from app.routes.files import FILE_LIST_FIELDS, DELETED_FILE_LIST_FIELDS
+from app.services.alert_service import sla_alerts_query
+from app.services.listing_service import file_listing_query
+from app.services.counter_service import file_counts_query
+from app.services.escalation_service import due_escalations_query, get_thresholds
+from app.services.scheduler_service import overdue_candidates_query, reminder_candidates_query
+
+app = create_app()
+
+# Tables that must never be read with a full scan by the hot queries
+LARGE_TABLES = ('file', 'alert')
+
+def hot_queries(now):
+    page = 51
+    batch = app.config.get('SLA_SWEEP_BATCH_SIZE', 500)
+    return {
+        'file listing': file_listing_query(FILE_LIST_FIELDS)
+            .filter(File.is_deleted == False)
+            .order_by(File.upload_date.desc(), File.id.desc()).limit(page),
+        'file listing (section)': file_listing_query(FILE_LIST_FIELDS)
+            .filter(File.is_deleted == False, File.section_id == 1)
+            .order_by(File.upload_date.desc(), File.id.desc()).limit(page),
+        'deleted listing': file_listing_query(DELETED_FILE_LIST_FIELDS)
+            .filter(File.is_deleted == True)
+            .order_by(File.upload_date.desc(), File.id.desc()).limit(page),
+        'alerts': sla_alerts_query(now),
+        'alerts (section)': sla_alerts_query(now, section_id=1),
+        # Built by the same functions the sweep and the counters use, so they cannot drift
+        'SLA sweep (overdue)': overdue_candidates_query(now, batch),
+        'SLA sweep (reminders)': reminder_candidates_query(now, batch),
+        'escalations': due_escalations_query(now, get_thresholds(app)),
+        'counter rebuild': file_counts_query(),
+        'alerts for file': Alert.query.filter_by(file_id=1),
+    }
+
+def explain(query):
+    compiled = query.statement.compile(dialect=db.engine.dialect)
+    params = tuple(
+        value.isoformat(' ') if isinstance(value, datetime) else value
+        for value in (compiled.params[name] for name in compiled.positiontup)
+    )
+    with db.engine.connect() as conn:
+        return [row[-1] for row in conn.exec_driver_sql('EXPLAIN QUERY PLAN ' + str(compiled), params)]
+
+def full_scans(plan):
+    # "SCAN file" is a full table scan; "SCAN file USING INDEX ..." walks an index instead
+    return [step for step in plan
+            if step.startswith('SCAN ') and step.split()[1] in LARGE_TABLES and 'USING' not in step]
+
+def verify():
+    with app.app_context():
+        if db.engine.dialect.name != 'sqlite':
+            print(f"EXPLAIN QUERY PLAN check only supports sqlite, not {db.engine.dialect.name}.")
+            return
+
+        failures = 0
+        for name, query in hot_queries(datetime.utcnow()).items():
+            plan = explain(query)
+            scans = full_scans(plan)
+            print(f"{'FAIL' if scans else 'PASS'}: {name}")
+            for step in plan:
+                print(f"    {step}")
+            failures += bool(scans)
+
+        assert failures == 0, f"{failures} hot queries still do full table scans"
+        print("All hot queries use indexes.")
+
+if __name__ == '__main__':
+    verify()
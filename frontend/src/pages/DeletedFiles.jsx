@@ -29,15 +29,20 @@ const PriorityBadge = ({ priority }) => {
 const DeletedFiles = () => {
     const [files, setFiles] = useState([]);
     const [loading, setLoading] = useState(true);
+    const [nextCursor, setNextCursor] = useState(null);
+    const [loadingMore, setLoadingMore] = useState(false);
 
-    const fetchDeletedFiles = async () => {
+    const fetchDeletedFiles = async (cursor = null) => {
+        if (cursor) setLoadingMore(true);
         try {
-            const response = await api.get('/file/deleted');
-            setFiles(response.data.files);
+            const response = await api.get('/file/deleted', { params: cursor ? { cursor } : {} });
+            setFiles(prev => cursor ? [...prev, ...response.data.files] : response.data.files);
+            setNextCursor(response.data.next_cursor);
         } catch (error) {
             console.error(error);
         } finally {
             setLoading(false);
+            setLoadingMore(false);
         }
     }
 
@@ -157,6 +162,18 @@ const DeletedFiles = () => {
             <div className="text-right text-xs text-slate-400 mt-4">
                 Showing {files.length} records
             </div>
+
+            {nextCursor && (
+                <div className="text-center mt-4">
+                    <button
+                        onClick={() => fetchDeletedFiles(nextCursor)}
+                        disabled={loadingMore}
+                        className="px-4 py-2 text-sm font-medium text-blue-600 bg-blue-50 rounded-lg hover:bg-blue-100 disabled:opacity-50"
+                    >
+                        {loadingMore ? 'Loading...' : 'Load more'}
+                    </button>
+                </div>
+            )}
         </div>
     );
 };
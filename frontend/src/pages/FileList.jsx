@@ -93,6 +93,8 @@ const DeleteModal = ({ isOpen, onClose, onConfirm, loading }) => {
 const FileList = () => {
     const [files, setFiles] = useState([]);
     const [loading, setLoading] = useState(true);
+    const [nextCursor, setNextCursor] = useState(null);
+    const [loadingMore, setLoadingMore] = useState(false);
     const { user } = useAuth();
     const [actionLoading, setActionLoading] = useState(null);
     
@@ -101,14 +103,17 @@ const FileList = () => {
     const [fileToDelete, setFileToDelete] = useState(null);
     const [deleteLoading, setDeleteLoading] = useState(false);
 
-    const fetchFiles = async () => {
+    const fetchFiles = async (cursor = null) => {
+        if (cursor) setLoadingMore(true);
         try {
-            const response = await api.get('/file/');
-            setFiles(response.data.files);
+            const response = await api.get('/file/', { params: cursor ? { cursor } : {} });
+            setFiles(prev => cursor ? [...prev, ...response.data.files] : response.data.files);
+            setNextCursor(response.data.next_cursor);
         } catch (error) {
             console.error(error);
         } finally {
             setLoading(false);
+            setLoadingMore(false);
         }
     }
 
@@ -307,6 +312,18 @@ const FileList = () => {
                 Showing {files.length} records
             </div>
 
+            {nextCursor && (
+                <div className="text-center mt-4">
+                    <button
+                        onClick={() => fetchFiles(nextCursor)}
+                        disabled={loadingMore}
+                        className="px-4 py-2 text-sm font-medium text-blue-600 bg-blue-50 rounded-lg hover:bg-blue-100 disabled:opacity-50"
+                    >
+                        {loadingMore ? 'Loading...' : 'Load more'}
+                    </button>
+                </div>
+            )}
+
             <DeleteModal
                 isOpen={isDeleteModalOpen}
                 onClose={() => setIsDeleteModalOpen(false)}